@@ -0,0 +1,359 @@
+"""Contains the BackupWriter class, for writing game backups in the background.
+
+A backup is a snapshot of the whole game state (see lib.state) plus an append-only
+journal. Each flush appends one journal entry holding only what changed: new past days
+and nights, new message history entries, and the small mutable working set (player
+state, the current day and the current night). Every so often the journal is compacted
+into a fresh snapshot. Journal entries reference players by id and messages by index,
+just like snapshots, so restoring replays them onto the snapshot's state and builds the
+game once.
+"""
+
+import asyncio
+import struct
+from hashlib import sha1
+from os import remove, replace
+from os.path import isfile
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from dill import loads as loads_legacy
+
+from lib.logic.Game import Game
+from lib.state import StateError, StateWriter, dumps, is_state, loads
+
+if TYPE_CHECKING:
+    from lib.bot import BOTCBot
+
+# The number of journal entries after which the journal is compacted into a snapshot.
+_COMPACT_AFTER = 100
+
+# Journal entries are prefixed with their length.
+_LENGTH = struct.Struct(">I")
+
+
+class IncompleteJournalError(StateError):
+    """A journal ends with a truncated entry, from a crash mid-append."""
+
+
+def write_atomically(file_name: str, data: bytes):
+    """Write data to a temporary file, then rename it over file_name.
+
+    This means a crash mid-write never leaves a truncated backup behind.
+    """
+    temp_name = file_name + ".tmp"
+    with open(temp_name, "wb") as file:
+        file.write(data)
+    replace(temp_name, file_name)
+
+
+def journal_path(snapshot_path: str) -> str:
+    """Determine the path of the journal accompanying a snapshot."""
+    return snapshot_path[: -len(".pckl")] + ".journal"
+
+
+class _Counters:
+    """How much of each append-only list has already been written.
+
+    Parameters
+    ----------
+    state : Dict[str, Any]
+        The game state most recently written, as generated by Game.to_state.
+    """
+
+    def __init__(self, state: Dict[str, Any]):
+        self.past_days = len(state["past_days"])
+        self.past_nights = len(state["past_nights"])
+        self.messages = len(state["messages"])
+        self.histories = {idn: len(x) for idn, x in state["histories"].items()}
+
+    def advance(self, entry: Dict[str, Any]):
+        """Account for a journal entry having been written."""
+        self.past_days += len(entry["past_days"])
+        self.past_nights += len(entry["past_nights"])
+        self.messages += len(entry["messages"])
+        for idn, indices in entry["histories"].items():
+            self.histories[idn] = self.histories.get(idn, 0) + len(indices)
+
+
+def _journal_entry(
+    game: Game, counters: _Counters
+) -> Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]:
+    """Convert everything that changed since counters were taken to plain data.
+
+    This reads the live game, so it must run on the event loop.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The journal entry.
+    Dict[int, Dict[str, Any]]
+        The states of the players in the working set, which with the entry's "live"
+        make up the digest compared between entries.
+    """
+    writer = StateWriter(counters.messages)
+    live = game.live_state(writer)
+    working = dict(writer.finish()[0])
+
+    histories = {}
+    for player in game.seating_order + game.storytellers:
+        new = player.message_history[counters.histories.get(player.id, 0) :]
+        if new:
+            histories[player.id] = [writer.message(message) for message in new]
+    past_days = [x.to_state(writer) for x in game.past_days[counters.past_days :]]
+    past_nights = [
+        x.to_state(writer) for x in game.past_nights[counters.past_nights :]
+    ]
+
+    # history may reference players outside the working set, like departed travelers
+    players, _ = writer.finish()
+    entry = {
+        "live": live,
+        "players": players,
+        "messages": writer.messages,
+        "histories": histories,
+        "past_days": past_days,
+        "past_nights": past_nights,
+    }
+    return entry, working
+
+
+def _encode_entry(
+    entry: Dict[str, Any],
+    working: Dict[int, Dict[str, Any]],
+    live_digest: Optional[bytes],
+) -> Optional[Tuple[bytes, bytes]]:
+    """Serialize a journal entry generated by _journal_entry.
+
+    Returns None if nothing changed, else the serialized entry and the digest of the
+    new working set.
+    """
+    digest = sha1(dumps([entry["live"], working])).digest()
+    if digest == live_digest and not (
+        entry["histories"] or entry["past_days"] or entry["past_nights"]
+    ):
+        return None
+
+    data = dumps(entry)
+    return _LENGTH.pack(len(data)) + data, digest
+
+
+def _replace_snapshot(file_name: str, data: Optional[bytes]):
+    """Replace the snapshot with data, or delete it if data is None, and the journal."""
+    if data is None:
+        if isfile(file_name):
+            remove(file_name)
+    else:
+        write_atomically(file_name, data)
+
+    if isfile(journal_path(file_name)):
+        remove(journal_path(file_name))
+
+
+def _append(file_name: str, data: bytes):
+    """Append a journal entry."""
+    with open(file_name, "ab") as file:
+        file.write(data)
+
+
+def _replay(state: Dict[str, Any], file_name: str) -> Tuple[int, bool]:
+    """Apply a journal to the state loaded from its snapshot.
+
+    A truncated final entry, from a crash mid-append, is ignored.
+
+    Returns
+    -------
+    int
+        The number of entries replayed.
+    bool
+        Whether the journal was complete, rather than ending with a truncated entry.
+    """
+    with open(file_name, "rb") as file:
+        data = file.read()
+
+    entries = 0
+    offset = 0
+    while offset + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        if offset + length > len(data):
+            return entries, False
+        entry = loads(data[offset : offset + length])
+        offset += length
+
+        # players are never removed, so that history can still reference them
+        state["live"] = entry["live"]
+        state["players"].update(entry["players"])
+        state["messages"] += entry["messages"]
+        for idn, indices in entry["histories"].items():
+            state["histories"].setdefault(idn, []).extend(indices)
+        state["past_days"] += entry["past_days"]
+        state["past_nights"] += entry["past_nights"]
+        entries += 1
+
+    return entries, True
+
+
+def load_backup(
+    file_name: str,
+) -> Tuple[Game, Optional[Dict[str, Any]], int, Optional[IncompleteJournalError]]:
+    """Load a game from its snapshot and journal.
+
+    Parameters
+    ----------
+    file_name : str
+        The path of the snapshot.
+
+    Returns
+    -------
+    Game
+        The restored game. Player members and the seating order message are still ids.
+    Optional[Dict[str, Any]]
+        The restored game's state, or None if the snapshot is a legacy pickle.
+    int
+        The number of journal entries replayed.
+    Optional[IncompleteJournalError]
+        The error to report if the journal ended with a truncated entry, which was
+        ignored, else None.
+    """
+    with open(file_name, "rb") as file:
+        data = file.read()
+
+    if not is_state(data):  # backups from before the state format have no journal
+        return loads_legacy(data), None, 0, None
+
+    state = loads(data)
+    entries, error = 0, None
+    if isfile(journal_path(file_name)):
+        entries, complete = _replay(state, journal_path(file_name))
+        if not complete:
+            error = IncompleteJournalError(
+                f"Ignored a truncated entry after {entries} journal entries."
+            )
+    return Game.from_state(state), state, entries, error
+
+
+class BackupWriter:
+    """Coalesces game backups into at most one journal entry per interval.
+
+    Commands mark the game dirty instead of dumping it immediately. A background task
+    serializes what changed in a thread executor and appends it to the journal,
+    skipping the write if nothing changed since the last one. Every _COMPACT_AFTER
+    entries, or when a new game starts, the whole game is written atomically as a new
+    snapshot and the journal is truncated.
+
+    Parameters
+    ----------
+    bot : BOTCBot
+        The bot whose game to back up.
+    interval : float
+        The minimum number of seconds between writes.
+
+    Attributes
+    ----------
+    dirty : bool
+        Whether the game has changed since it was last backed up.
+    bot
+    interval
+    """
+
+    def __init__(self, bot: "BOTCBot", interval: float = 5.0):
+        self.bot = bot
+        self.interval = interval
+        self.dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self._game: Optional[Game] = None
+        self._counters: Optional[_Counters] = None
+        self._live_digest: Optional[bytes] = None
+        self._entries = 0
+
+    def mark_dirty(self):
+        """Request a backup at the end of the current interval."""
+        self.dirty = True
+
+    def start(self):
+        """Start the background task, if it isn't already running."""
+        if self._task is None or self._task.done():
+            self._task = self.bot.loop.create_task(self._run())
+
+    def adopt(self, game: Game, state: Optional[Dict[str, Any]], entries: int):
+        """Continue journaling a game restored from a snapshot and journal.
+
+        If state is None, the next flush writes a fresh snapshot instead.
+        """
+        self._game = game if state is not None else None
+        self._counters = _Counters(state) if state is not None else None
+        self._live_digest = None
+        self._entries = entries
+
+    async def _run(self):
+        """Flush dirty state every interval."""
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.dirty:
+                try:
+                    await self.flush()
+                except Exception as e:  # the writer must outlive a failed backup
+                    self._game = None  # start over with a fresh snapshot
+                    self.bot.report_error("backup", e)
+
+    def compact(self):
+        """Write a full snapshot and truncate the journal, blocking the event loop."""
+        self.dirty = False
+        game = self.bot.game
+        state = game.to_state() if game else None
+        _replace_snapshot(self.bot.backup_path(), state and dumps(state))
+        self._snapshot_written(game, state)
+
+    def _snapshot_written(self, game: Optional[Game], state: Optional[Dict[str, Any]]):
+        """Journal onto a snapshot of game in state, or nothing if game is None."""
+        if game is None:
+            self._game = None
+            self._counters = None
+        else:
+            self.adopt(game, state, 0)
+
+    async def flush(self):
+        """Back up the current gamestate now, without blocking the event loop.
+
+        The game is converted to plain data here, on the event loop, so that commands
+        can't change it part way through; only serializing and writing the data happen
+        in the executor.
+        """
+        self.dirty = False
+        game = self.bot.game
+        loop = self.bot.loop
+        file_name = self.bot.backup_path()
+
+        if not game:
+            # a failed flush forgets the game, but may have left its backup behind
+            if self._game is not None or isfile(file_name):
+                await loop.run_in_executor(None, _replace_snapshot, file_name, None)
+                self._snapshot_written(None, None)
+            return
+
+        if game is not self._game or self._entries >= _COMPACT_AFTER:
+            state = game.to_state()
+            data = await loop.run_in_executor(None, dumps, state)
+            await loop.run_in_executor(None, _replace_snapshot, file_name, data)
+            self._snapshot_written(game, state)
+            return
+
+        counters = self._counters
+        entry, working = _journal_entry(game, counters)
+        encoded = await loop.run_in_executor(
+            None, _encode_entry, entry, working, self._live_digest
+        )
+        if encoded is None:
+            return
+
+        if self._counters is not counters:
+            # a snapshot was written meanwhile, and already includes this entry
+            return
+
+        data, digest = encoded
+        await loop.run_in_executor(None, _append, journal_path(file_name), data)
+        if self._counters is not counters:
+            return
+        counters.advance(entry)
+        self._live_digest = digest
+        self._entries += 1
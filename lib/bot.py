@@ -1,20 +1,26 @@
 """Contains the BOTCBot class."""
 
+import sys
+import traceback
 import typing
 from os import remove
 from os.path import isfile
 
 import discord
-from dill import dump, load
 from discord.ext import commands
 
+from lib.backup import BackupWriter, load_backup, write_atomically
 from lib.logic.Character import Storyteller
 from lib.logic.Game import Game
+from lib.logic.PinRegistry import PinRegistry
 from lib.logic.Player import Player
 from lib.logic.converters import to_character_list
 from lib.logic.playerconverter import to_member_list
 from lib.logic.tools import generate_game_info_message
+from lib.outbox import Outbox
 from lib.preferences import load_preferences
+from lib.roles import RoleIndex
+from lib.state import StateError, dumps
 from lib.utils import safe_send, get_input, safe_bug_report
 
 if typing.TYPE_CHECKING:
@@ -51,6 +57,11 @@ class BOTCBot(commands.Bot):
         self._observerid = observerid
         self.config = config
         self.game: typing.Optional[Game] = None
+        self.backups = BackupWriter(self)
+        self.outbox = Outbox(self)
+        self.roles = RoleIndex(
+            (storytellerid, playerid, inactiveid, playtestid, observerid)
+        )
 
     @property
     def server(self) -> discord.Guild:
@@ -89,6 +100,32 @@ class BOTCBot(commands.Bot):
         """Determine the bot's observer role."""
         return self.server.get_role(self._observerid)
 
+    @property
+    def observers(self) -> typing.List[discord.Member]:
+        """Determine the members with the bot's observer role."""
+        return [
+            member
+            for member in map(
+                self.server.get_member, self.roles.members(self._observerid)
+            )
+            if member is not None
+        ]
+
+    def is_storyteller(self, user: typing.Union[discord.abc.User, int, None]) -> bool:
+        """Determine whether a user has the bot's Storyteller role."""
+        return self.roles.has_role(user, self._storytellerid)
+
+    def is_inactive(self, user: typing.Union[discord.abc.User, int, None]) -> bool:
+        """Determine whether a user has the bot's inactive role."""
+        return self.roles.has_role(user, self._inactiveid)
+
+    def is_playtester(self, user: typing.Union[discord.abc.User, int, None]) -> bool:
+        """Determine whether a user has the bot's playtest role.
+
+        Always False if the bot does not have playtest characters enabled.
+        """
+        return self.playtest and self.roles.has_role(user, self._playtestid)
+
     @property
     def instant_message_reporting(self) -> bool:
         """Determine whether the bot uses instant message reporting."""
@@ -150,16 +187,19 @@ class BOTCBot(commands.Bot):
                 for index, person in enumerate(users)
             ]
 
+            # record the pins made this game
+            pins = PinRegistry(len(await self.channel.pins()))
+
             # script message
             posts = []
             for content in list(script.info(ctx)):
-                posts.append(await safe_send(self.channel, content))
+                posts.append(await self.outbox.announce(self.channel, content))
 
             for post in posts[::-1]:  # Reverse the _order so the pins are right
-                await post.pin()
+                await pins.pin(post)
 
             # welcome message
-            await safe_send(
+            await self.outbox.announce(
                 self.channel,
                 (
                     f"{self.player_role.mention}, "
@@ -169,20 +209,24 @@ class BOTCBot(commands.Bot):
             )
 
             # seating order message
-            seating_order_message = await safe_send(
+            seating_order_message = await self.outbox.announce(
                 self.channel,
                 generate_game_info_message(seating_order, ctx.bot.game),
-                pin=True,
             )
+            await pins.pin(seating_order_message)
 
             # storytellers
             storytellers = [
                 Player(person, Storyteller, None)
-                for person in self.storyteller_role.members
+                for person in map(
+                    self.server.get_member, self.roles.members(self._storytellerid)
+                )
+                if person is not None
             ]
 
             # start the game
             self.game = Game(seating_order, seating_order_message, script, storytellers)
+            self.game.pins = pins
             if safe_bug_report(ctx):
                 await safe_send(ctx, "Started the game successfully.")
             await self.game.start_night(ctx)
@@ -216,39 +260,66 @@ class BOTCBot(commands.Bot):
                 ),
             )
 
+    def backup_path(self, file_name: str = "current_game.pckl") -> str:
+        """Determine the path of one of the bot's backup files."""
+        return "resources/backup/" + self.bot_name + "/" + file_name
+
     def backup(self, file_name: str = "current_game.pckl"):
-        """Backs up the current gamestate."""
-        file_name = "resources/backup/" + self.bot_name + "/" + file_name
+        """Backs up the current gamestate immediately, as a full snapshot.
+
+        Most callers should use self.backups.mark_dirty() instead, which journals
+        only what changed and writes off the event loop.
+        """
+        if file_name == "current_game.pckl":
+            self.backups.compact()
+            return
+
+        file_name = self.backup_path(file_name)
 
         if self.game:
-            with open(file_name, "wb") as file:
-                dump(self.game, file)
+            write_atomically(file_name, dumps(self.game.to_state()))
         else:
             if isfile(file_name):
                 remove(file_name)
 
+    async def close(self):
+        """Deliver pending notifications and write any pending backup on shutdown."""
+        await self.outbox.close()
+        if self.backups.dirty:
+            self.backups.compact()
+        await super().close()
+
+    def report_error(self, event: str, error: BaseException):
+        """Report an error in a background task, which no command handler will see.
+
+        The error is printed like discord.py's on_error prints errors in events.
+        """
+        print(f"Ignoring exception in {event}", file=sys.stderr)
+        traceback.print_exception(type(error), error, error.__traceback__)
+
     async def restore_backup(self, file_name: str = "current_game.pckl", mute=False):
         """Restores a backup."""
-        file_name = "resources/backup/" + self.bot_name + "/" + file_name
+        file_name = self.backup_path(file_name)
 
         # restore backups
         try:
 
-            with open(file_name, "rb") as file:
-                self.game = load(file)
+            self.game, state, entries, error = load_backup(file_name)
+            if error is not None:
+                self.report_error("restore_backup", error)
 
             # catch game being none
             # should never be possible if the file exists, but just in case
             assert self.game
 
-            # do some unpickling
+            # resolve discord objects, which are stored as ids
             # noinspection PyTypeChecker
-            # the seating order message is pickled as an int so this is fine
             self.game.seating_order_message = await self.channel.fetch_message(
                 self.game.seating_order_message
             )
             for player in self.game.seating_order + self.game.storytellers:
                 player.member = self.server.get_member(player.member)
+            self.backups.adopt(self.game, state, entries)
 
             # print
             if not mute:
@@ -261,7 +332,7 @@ class BOTCBot(commands.Bot):
                 print("No backup found.")
             return None
 
-        except EOFError:
+        except (EOFError, StateError):
             self.game = None
             print("Backup incomplete.")  # do this even if mute because it
             # represents an error
@@ -294,19 +365,27 @@ class BOTCBot(commands.Bot):
     async def _startgame_role_cleanup(self, users: typing.List[discord.Member]):
         """Handle role cleanup for startgame."""
         # clear all player roles
-        for memb in self.player_role.members:
-            await memb.remove_roles(self.player_role)
+        for idn in self.roles.members(self._playerid):
+            memb = self.server.get_member(idn)
+            if memb is not None:
+                await memb.remove_roles(self.player_role)
+                self.roles.remove_role(memb, self._playerid)
 
         # modify roles for players
         for user in users:
 
             # add player role
             await user.add_roles(self.player_role)
+            self.roles.add_role(user, self._playerid)
 
             # remove storyteller role
-            if self.storyteller_role in user.roles:
+            if self.is_storyteller(user):
                 await user.remove_roles(self.storyteller_role)
+                self.roles.remove_role(user, self._storytellerid)
 
         # add player role for storytellers
-        for memb in self.storyteller_role.members:
-            await memb.add_roles(self.player_role)
+        for idn in self.roles.members(self._storytellerid):
+            memb = self.server.get_member(idn)
+            if memb is not None:
+                await memb.add_roles(self.player_role)
+                self.roles.add_role(memb, self._playerid)
@@ -124,7 +124,7 @@ def is_storyteller() -> Callable:
             True if the command succeeds, else raises an exception.
 
         """
-        if ctx.bot.server.get_member(ctx.author.id) in ctx.bot.storyteller_role.members:
+        if ctx.bot.is_storyteller(ctx.author):
             return True
         raise commands.CheckFailure(message="Sorry! Only storytellers can do that.")
 
@@ -26,6 +26,9 @@ class Debug(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
         with ctx.typing():
             for msg in await ctx.bot.channel.pins():
                 await msg.unpin()
+            if ctx.bot.game:
+                ctx.bot.game.pins.pinned.clear()
+                ctx.bot.game.pins.external = 0
 
         await safe_send(ctx, "Unpinned all messages.")
 
@@ -2,13 +2,14 @@
 
 import asyncio
 
-from discord import HTTPException
+from discord import HTTPException, Member
 from discord.ext import commands
 
 from lib.bot import BOTCBot
 from lib.exceptions import PlayerNotFoundError
 from lib.logic.Character import Storyteller
 from lib.logic.Player import Player
+from lib.preferences import preload_preferences
 from lib.typings.context import Context
 from lib.utils import get_player, safe_bug_report, safe_send
 
@@ -40,20 +41,37 @@ async def _generic_error_handler(ctx: Context, error, text):
     raise error
 
 
-def _update_player_members(bot, after):
-    """Update player members when they change."""
-    try:
-        player = get_player(bot.game, after)
-        player.member = after
-    except PlayerNotFoundError:
-        pass
+def _update_player_members(bot: BOTCBot, after: Member) -> bool:
+    """Update player members when they change.
 
+    Returns whether the member is in the game.
+    """
+    found = False
+    for include_storytellers in (False, True):
+        try:
+            player = get_player(bot.game, after.id, include_storytellers)
+            player.member = after
+            found = True
+        except PlayerNotFoundError:
+            pass
+    return found
 
-def _update_storyteller_list(bot, after, before):
-    """Add new storytellers to the Storyteller list."""
-    if bot.storyteller_role not in before.roles and bot.storyteller_role in after.roles:
-        bot.game.storytellers.append(Player(after, Storyteller, None))
-    bot.backup()
+
+def _update_storyteller_list(
+    bot: BOTCBot, after: Member, was_storyteller: bool
+) -> bool:
+    """Add new storytellers to the Storyteller list.
+
+    Returns whether a storyteller was added.
+    """
+    if (
+        not was_storyteller
+        and bot.is_storyteller(after)
+        and after.id not in [st.id for st in bot.game.storytellers]
+    ):
+        bot.game.add_storyteller(Player(after, Storyteller, None))
+        return True
+    return False
 
 
 class Events(commands.Cog):
@@ -70,8 +88,15 @@ class Events(commands.Cog):
         print("Server:", self.bot.server)
         print("Gameplay Channel: #", self.bot.channel.name)
 
+        # cache preferences
+        preload_preferences()
+
+        # index role members
+        self.bot.roles.build(self.bot.server)
+
         # restore backups
         await self.bot.restore_backup()
+        self.bot.backups.start()
 
         # update status
         await self.bot.update_status()
@@ -161,22 +186,58 @@ class Events(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
-        """Handle member updates."""
-        if self.bot.game:
+        """Handle member updates.
+
+        Most member updates (status, other roles, members not in the game) are
+        irrelevant to the game, so they are discarded without touching it.
+        """
+        if after.guild != self.bot.server:
+            return
 
-            # update player objects with changes
-            _update_player_members(self.bot, after)
+        # keep the role index current, remembering whether they were a storyteller
+        was_storyteller = self.bot.is_storyteller(after)
+        if before.roles != after.roles:
+            self.bot.roles.update(after)
+
+        if not self.bot.game:
+            return
 
-            # add new storytellers to the seating order
-            _update_storyteller_list(self.bot, after, before)
+        # update player objects with changes
+        in_game = _update_player_members(self.bot, after)
+
+        # add new storytellers to the seating order
+        # only role changes can do this, so skip the role scan for everything else
+        if in_game or before.roles != after.roles:
+            if _update_storyteller_list(self.bot, after, was_storyteller):
+                self.bot.backups.mark_dirty()
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before, after):
+        """Keep cached messages current when they are edited."""
+        if (
+            self.bot.game is not None
+            and after.channel == self.bot.channel
+            and after.id in self.bot.game.message_cache
+        ):
+            self.bot.game.message_cache.record(after)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        """Remove members who leave the server from the role index."""
+        if member.guild == self.bot.server:
+            self.bot.roles.remove(member)
 
     @commands.Cog.listener()
     async def on_message(self, message):
         """Handle messages."""
-        if message.author.bot:
+        if not message.channel == self.bot.channel:
             return
 
-        if not message.channel == self.bot.channel:
+        # only the bot's own messages are ever looked up again
+        if self.bot.game is not None and message.author == self.bot.user:
+            self.bot.game.message_cache.record(message)
+
+        if message.author.bot:
             return
 
         if self.bot.game is None or self.bot.game.current_day is None:
@@ -184,7 +245,7 @@ class Events(commands.Cog):
 
         try:
             player = get_player(self.bot.game, message.author.id, False)
-            await player.make_active(self.bot.game)
+            await player.make_active(self.bot)
         except PlayerNotFoundError:
             pass
 
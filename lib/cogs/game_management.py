@@ -83,14 +83,13 @@ class GameManagement(commands.Cog, name="Game Management"):  # type: ignore
 
             # add the player role
             await traveler_actual.add_roles(ctx.bot.player_role)
+            ctx.bot.roles.add_role(traveler_actual, ctx.bot.player_role.id)
 
             # add them to the seating order
-            ctx.bot.game.seating_order.insert(
-                upwards_neighbor_actual.position + 1, player
-            )
+            ctx.bot.game.add_traveler(player)
 
             # announcement
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel,
                 (
                     "{townsfolk}, {player} has joined the town as the {traveler}. "
@@ -104,7 +103,7 @@ class GameManagement(commands.Cog, name="Game Management"):  # type: ignore
             )
 
             # rules
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel,
                 f"\n**{player.character.name}** - {player.character.rules_text()}",
                 pin=True,
@@ -131,10 +130,10 @@ class GameManagement(commands.Cog, name="Game Management"):  # type: ignore
             raise commands.BadArgument(f"{traveler_actual.nick} is not a traveler.")
 
         # remove them from the seating order
-        ctx.bot.game.seating_order.remove(traveler_actual)
+        ctx.bot.game.remove_traveler(traveler_actual)
 
         # announcement
-        await safe_send(
+        await ctx.bot.outbox.announce(
             ctx.bot.channel,
             (
                 "{townsfolk}, {traveler} has left the town. "
@@ -243,7 +242,7 @@ class GameManagement(commands.Cog, name="Game Management"):  # type: ignore
         """
         traveler_actual = await to_player(ctx, traveler)
         if not traveler_actual.is_status(ctx.bot.game, "traveler"):
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel, f"{traveler_actual.nick} is not a traveler.",
             )
             return
@@ -261,7 +260,9 @@ class GameManagement(commands.Cog, name="Game Management"):  # type: ignore
         player: The player to be revived.
         """
         player_actual = await to_player(ctx, player)
-        await safe_send(ctx.bot.channel, player_actual.revive(ctx.bot.game), pin=True)
+        await ctx.bot.outbox.announce(
+            ctx.bot.channel, player_actual.revive(ctx.bot.game), pin=True
+        )
         await safe_send(ctx, f"Successfully revived {player_actual.nick}.")
 
 
@@ -66,24 +66,27 @@ class GameProgression(commands.Cog, name="Game Progression"):  # type: ignore
 
             # endgame message
             if winner != "neutral":
-                await safe_send(
+                await ctx.bot.outbox.announce(
                     ctx.bot.channel,
                     f"{ctx.bot.player_role.mention}, {winner} has won. Good game!",
                 )
             else:
-                await safe_send(
+                await ctx.bot.outbox.announce(
                     ctx.bot.channel,
                     f"{ctx.bot.player_role.mention}, the game is being remade.",
                 )
 
             # unpin messages
-            for msg in await ctx.bot.channel.pins():
-                if (
-                    msg.created_at
-                    >= ctx.bot.game.seating_order_message.created_at
-                    - timedelta(minutes=1)  # this will unpin the script messages too
-                ):
-                    await msg.unpin()
+            if ctx.bot.game.pins.complete:
+                await ctx.bot.game.pins.unpin_all(ctx.bot.channel)
+            else:  # a game from an old backup, whose pins weren't recorded
+                for msg in await ctx.bot.channel.pins():
+                    if (
+                        msg.created_at
+                        >= ctx.bot.game.seating_order_message.created_at
+                        - timedelta(minutes=1)  # this unpins the script messages too
+                    ):
+                        await msg.unpin()
 
             # backup
             i = 1
@@ -123,7 +126,7 @@ class GameProgression(commands.Cog, name="Game Progression"):  # type: ignore
             await safe_send(ctx, "Cancelled.")
             return
 
-        await safe_send(ctx.bot.channel, "No one was executed.")
+        await ctx.bot.outbox.announce(ctx.bot.channel, "No one was executed.")
         await ctx.bot.game.current_day.end(ctx)
 
     @commands.command()
@@ -236,7 +239,7 @@ class GameProgression(commands.Cog, name="Game Progression"):  # type: ignore
             pacific_name = "PST"
             eastern_name = "EST"
 
-        await safe_send(
+        await ctx.bot.outbox.announce(
             ctx.bot.channel,
             (
                 f"{ctx.bot.player_role.mention}, nominations are open! "
@@ -59,7 +59,9 @@ class Info(commands.Cog, name="Info"):  # type: ignore
         The message must be in the main gameplay channel.
         """
         try:
-            time = (await ctx.bot.channel.fetch_message(idn)).created_at
+            time = (
+                await ctx.bot.game.message_cache.get(ctx.bot.channel, idn)
+            ).created_at
             await safe_send(
                 ctx, generate_message_tally(ctx, lambda msg: msg["time"] >= time,),
             )
@@ -171,7 +171,9 @@ class Playing(commands.Cog):
         author_player = get_player(ctx.bot.game, ctx.author.id, False)
         if author_player.can_nominate(ctx.bot.game):
             await author_player.add_nomination(ctx, skip=True)
-            await safe_send(ctx.bot.channel, f"{author_player.nick} has skipped.")
+            await ctx.bot.outbox.announce(
+                ctx.bot.channel, f"{author_player.nick} has skipped."
+            )
         else:
             raise commands.BadArgument("You cannot nominate today.")
 
@@ -5,7 +5,7 @@ from discord.ext import commands
 from lib import checks
 from lib.bot import BOTCBot
 from lib.logic.converters import to_character, to_character_list, to_script
-from lib.logic.Script import Script, script_list
+from lib.logic.Script import Script, find_script_named, script_list
 from lib.preferences import load_preferences
 from lib.typings.context import Context
 from lib.utils import get_input, safe_send
@@ -39,25 +39,22 @@ class ScriptManagement(commands.Cog, name="Scripts"):  # type: ignore
             text: Enter the characters in a line break-separated message.
         name: The script's name.
         """
-        with ctx.typing():
-
-            for script in script_list(ctx, playtest=True):
-
-                # Check duplicate names
-                if script.name.lower() == name.lower():
-                    _check_permission_to_edit(ctx, ctx.author.id, script)
-                    # _check_permission_to_edit raises a BadArgument exception on
-                    # failure, which is handled in Events.on_command_error, so we don't
-                    # have to do any handling of that case here
-                    await safe_send(
-                        ctx,
-                        (
-                            f"There is already a script named {name}. "
-                            "You can modify it or delete it:"
-                        ),
-                    )
-                    await ctx.send_help(ctx.bot.get_command("script"))
-                    return
+        # Check duplicate names
+        script = find_script_named(name, playtest=True)
+        if script is not None:
+            _check_permission_to_edit(ctx, ctx.author.id, script)
+            # _check_permission_to_edit raises a BadArgument exception on failure,
+            # which is handled in Events.on_command_error, so we don't have to do any
+            # handling of that case here
+            await safe_send(
+                ctx,
+                (
+                    f"There is already a script named {name}. "
+                    "You can modify it or delete it:"
+                ),
+            )
+            await ctx.send_help(ctx.bot.get_command("script"))
+            return
 
         # Get the characters
         if mode == "json":
@@ -166,10 +163,7 @@ class ScriptManagement(commands.Cog, name="Scripts"):  # type: ignore
         with ctx.typing():
             for script in script_list(
                 ctx,
-                playtest=(
-                    ctx.bot.playtest_role is not None
-                    and ctx.author in ctx.bot.playtest_role.members
-                ),
+                playtest=ctx.bot.is_playtester(ctx.author),
             ):
                 await safe_send(ctx, script.short_info(ctx))
 
@@ -1,16 +1,15 @@
 """Contains the Character and Storyteller classes and several Character subclasses."""
 
-import json
 from abc import ABC
-from typing import TYPE_CHECKING, Dict, List, Tuple, Type
+from typing import TYPE_CHECKING, FrozenSet, List, Tuple, Type
 
 from discord.ext import commands
 
 from lib.abc import NightOrderMember
+from lib.logic.charinfo import character_info
 from lib.logic.Effect import (Dead, DemonEffect, Evil, Good, MinionEffect,
                               OutsiderEffect, StorytellerEffect,
                               TownsfolkEffect, TravelerEffect)
-from lib.utils import safe_send
 
 if TYPE_CHECKING:
     from lib.logic.Effect import Effect
@@ -18,6 +17,10 @@ if TYPE_CHECKING:
     from lib.typings.context import GameContext, DayContext
 
 
+# methods called by the game's event bus, which most characters leave as no-ops
+character_hooks = ("nomination",)
+
+
 class Character(NightOrderMember):
     """A generic character.
 
@@ -30,12 +33,25 @@ class Character(NightOrderMember):
     ----------
     default_effects : List[Type[Effect]]
         The effects a character starts with.
+    hooks : FrozenSet[str]
+        The event hooks (see character_hooks) which the class overrides, and so which
+        the game's event bus dispatches to it.
     parent: Player
     """
 
     name: str = "Character"
     playtest: bool = False
     default_effects: List[Type["Effect"]]
+    hooks: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        """Determine the new class's hooks."""
+        super().__init_subclass__(**kwargs)
+        cls.hooks = frozenset(
+            hook
+            for hook in character_hooks
+            if getattr(cls, hook) is not getattr(Character, hook)
+        )
 
     def __init__(self, parent: "Player"):
         self.parent = parent
@@ -95,22 +111,13 @@ class Character(NightOrderMember):
         """
         pass
 
-    @classmethod
-    def _char_info(cls) -> Dict:
-        if not cls.playtest:
-            with open("resources/basegame/character_info.json", "r") as fp:
-                return json.load(fp)[cls.name]
-        else:
-            with open("resources/d/character_info.json", "r") as fp:
-                return json.load(fp)[cls.name]
-
     @classmethod
     def rules_text(cls) -> str:
         """Generate the character's rules text."""
-        try:
-            return cls._char_info()["rules"]
-        except KeyError:
+        info = character_info(cls.name, cls.playtest)
+        if info is None:
             return "Rules text not found."
+        return info.rules
 
     async def morning_call(self, ctx: "GameContext") -> str:
         """Generate the character's initial morning call.
@@ -186,19 +193,19 @@ class Traveler(Character, ABC):
     async def exile(self, ctx: "GameContext"):
         """Exile the traveler."""
         if self.parent.ghost(ctx.bot.game):
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel,
                 f"{self.parent.nick} has been exiled, but is already dead.",
             )
 
         elif self.parent.is_status(ctx.bot.game, "safe"):
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel,
                 f"{self.parent.nick} has been exiled, but does not die.",
             )
 
         else:
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel, f"{self.parent.nick} has been exiled, and dies."
             )
             self.parent.add_effect(ctx.bot.game, Dead, self.parent)
@@ -1,6 +1,6 @@
 """Contains the Day class."""
 
-from typing import TYPE_CHECKING, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from discord.ext import commands
 from numpy import ceil
@@ -14,6 +14,7 @@ from lib.utils import safe_bug_report, safe_send
 
 if TYPE_CHECKING:
     from lib.logic.Game import Game
+    from lib.state import StateReader, StateWriter
     from lib.typings.context import DayContext
 
 
@@ -44,6 +45,36 @@ class Day:
         self.about_to_die = None  # type: Optional[Tuple[Player, int, int]]
         self.vote_end_messages = []  # type: List[int]
 
+    def to_state(self, writer: "StateWriter") -> Dict[str, Any]:
+        """Convert the day to plain data."""
+        about_to_die = None
+        if self.about_to_die is not None:
+            player, votes, announcement = self.about_to_die
+            about_to_die = [writer.player(player), votes, announcement]
+        return {
+            "is_pms": self.is_pms,
+            "is_noms": self.is_noms,
+            "past_votes": [vote.to_state(writer) for vote in self.past_votes],
+            "current_vote": self.current_vote and self.current_vote.to_state(writer),
+            "about_to_die": about_to_die,
+            "vote_end_messages": list(self.vote_end_messages),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], reader: "StateReader") -> "Day":
+        """Create a day from plain data generated by to_state."""
+        day = cls()
+        day.is_pms = state["is_pms"]
+        day.is_noms = state["is_noms"]
+        day.past_votes = [Vote.from_state(x, reader) for x in state["past_votes"]]
+        if state["current_vote"] is not None:
+            day.current_vote = Vote.from_state(state["current_vote"], reader)
+        if state["about_to_die"] is not None:
+            idn, votes, announcement = state["about_to_die"]
+            day.about_to_die = (reader.player(idn), votes, announcement)
+        day.vote_end_messages = state["vote_end_messages"]
+        return day
+
     async def nominate(self, ctx: "DayContext", nominee_str: str, nominator: Player):
         """Begin a vote on the nominee.
 
@@ -67,13 +98,8 @@ class Day:
 
         # check effects
         proceed = True
-        for player in ctx.bot.game.seating_order:
-            proceed = (
-                await player.character.nomination(ctx, nominee, nominator) and proceed
-            )
-            effect_list = [x for x in player.effects]
-            for effect in effect_list:
-                proceed = await effect.nomination(ctx, nominee, nominator) and proceed
+        for subscriber in ctx.bot.game.events.subscribers("nomination"):
+            proceed = await subscriber.nomination(ctx, nominee, nominator) and proceed
 
         if not proceed:
             return
@@ -103,7 +129,7 @@ class Day:
             majority=int(ceil(self.current_vote.majority)),
             about_to_die=self.about_to_die,
         )
-        msg = await safe_send(ctx.bot.channel, message_text, pin=True)
+        msg = await ctx.bot.outbox.announce(ctx.bot.channel, message_text, pin=True)
 
         # pin
         self.current_vote.announcements.append(msg.id)
@@ -117,14 +143,16 @@ class Day:
     async def _send_message_tally(self, ctx):
         try:
             time = (
-                await ctx.bot.channel.fetch_message(self.vote_end_messages[-1])
+                await ctx.bot.game.message_cache.get(
+                    ctx.bot.channel, self.vote_end_messages[-1]
+                )
             ).created_at
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel,
                 generate_message_tally(ctx, lambda x: x["time"] >= time),
             )
         except IndexError:
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel,
                 generate_message_tally(
                     ctx, lambda x: x["day"] == ctx.bot.game.day_number
@@ -135,44 +163,42 @@ class Day:
         """Open PMs."""
         self.is_pms = True
         for st in ctx.bot.game.storytellers:
-            await safe_send(st.member, "PMs are now open.")
+            ctx.bot.outbox.notify(st.member, "PMs are now open.")
         await ctx.bot.update_status()
 
     async def open_noms(self, ctx: "DayContext"):
         """Open nominations."""
         self.is_noms = True
         for st in ctx.bot.game.storytellers:
-            await safe_send(st.member, "Nominations are now open.")
+            ctx.bot.outbox.notify(st.member, "Nominations are now open.")
         await ctx.bot.update_status()
 
     async def close_pms(self, ctx: "DayContext"):
         """Close PMs."""
         self.is_pms = False
         for st in ctx.bot.game.storytellers:
-            await safe_send(st.member, "PMs are now closed.")
+            ctx.bot.outbox.notify(st.member, "PMs are now closed.")
         await ctx.bot.update_status()
 
     async def close_noms(self, ctx: "DayContext"):
         """Close nominations."""
         self.is_noms = False
         for st in ctx.bot.game.storytellers:
-            await safe_send(st.member, "Nominations are now closed.")
+            ctx.bot.outbox.notify(st.member, "Nominations are now closed.")
         await ctx.bot.update_status()
 
     async def end(self, ctx: "DayContext"):
         """End the day."""
         # cleanup effects
-        for player in ctx.bot.game.seating_order:
-            effect_list = [x for x in player.effects]
-            for effect in effect_list:
-                effect.evening_cleanup(ctx.bot.game)
+        for effect in ctx.bot.game.events.subscribers("evening_cleanup"):
+            effect.evening_cleanup(ctx.bot.game)
 
         # remove the current vote
         if self.current_vote:
             await self.current_vote.cancel(ctx)
 
         # announcement
-        await safe_send(
+        await ctx.bot.outbox.announce(
             ctx.bot.channel, f"{ctx.bot.player_role.mention}, go to sleep!",
         )
 
@@ -1,10 +1,16 @@
 """Contains the Effect class and several Effect subclass ABCs."""
 
-from typing import TYPE_CHECKING, Callable
+from copy import deepcopy
+from enum import IntFlag
+from inspect import getattr_static
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Set
+
+from lib.state import class_name, resolve_class
 
 if TYPE_CHECKING:
     from lib.logic.Player import Player
     from lib.logic.Game import Game
+    from lib.state import StateReader, StateWriter
 
 # TODO: add user-facing names for statuses
 
@@ -32,6 +38,72 @@ status_list = [
     "storyteller",  # The player is a Storyteller.
 ]
 
+_status_set = frozenset(status_list)
+
+# The statuses as bit flags, for instance Status.minion | Status.demon.
+Status = IntFlag("Status", status_list, module=__name__)  # type: ignore
+
+# status name -> bit, and back, as plain ints for speed
+status_bits = {name: int(Status[name]) for name in status_list}
+status_names = {bit: name for name, bit in status_bits.items()}
+
+# statuses caused whenever any of the listed statuses is, unless overridden
+_derived_statuses = {
+    "not_functioning": ("poisoned", "drunk", "dead"),
+    "safe_from_demon": ("safe",),
+}
+
+StatusFunction = Callable[["Effect", "Game"], bool]
+
+# methods called by the game's event bus, which most effects leave as no-ops
+effect_hooks = (
+    "nomination",
+    "morning_cleanup",
+    "evening_cleanup",
+    "source_death_cleanup",
+    "source_drunkpoisoned_cleanup",
+)
+
+
+# status methods which cause their status unconditionally, marked with _unconditional
+_unconditional_functions = set()  # type: Set[Callable[..., bool]]
+
+
+def _unconditional(func: Callable[..., bool]) -> Callable[..., bool]:
+    """Mark a status method as always causing its status.
+
+    Classes which inherit the method resolve the status to _always, which _any_status
+    can short-circuit on. A subclass which overrides it is evaluated normally.
+    """
+    _unconditional_functions.add(func)
+    return func
+
+
+# noinspection PyUnusedLocal
+def _always(effect: "Effect", game: "Game") -> bool:
+    """Cause a status unconditionally."""
+    return True
+
+
+def _status_function(cls: type, name: str) -> StatusFunction:
+    """Normalize a status method of cls to take the effect and the game."""
+    raw = getattr_static(cls, name)
+    func = getattr(cls, name)
+    if func in _unconditional_functions:
+        return _always
+    if isinstance(raw, staticmethod):
+        return lambda effect, game: func(game)
+    return func
+
+
+def _any_status(functions: List[StatusFunction]) -> StatusFunction:
+    """Combine status functions into one which is true when any of them are."""
+    if _always in functions:
+        return _always
+    if len(functions) == 1:
+        return functions[0]
+    return lambda effect, game: any(f(effect, game) for f in functions)
+
 
 class Effect:
     """Stores information about a game effect.
@@ -47,12 +119,63 @@ class Effect:
     ----------
     disabled: bool
         Whether the effect is currently disabled.
+    status_table : Dict[str, Callable[[Effect, Game], bool]]
+        The statuses the class can cause, and functions determining whether it does.
+        Built when the class is defined or decorated, so that status never has to
+        probe for methods.
+    registers_table : Dict[str, Callable[[Effect, Game], bool]]
+        Similarly, the statuses the class can cause registering as.
+    hooks : FrozenSet[str]
+        The event hooks (see effect_hooks) which the class overrides, and so which
+        the game's event bus dispatches to it.
     affected_player
     source_player
     """
 
     _name: str = "Effect"
     appears: bool = True
+    status_table: Dict[str, StatusFunction]
+    registers_table: Dict[str, StatusFunction]
+    hooks: FrozenSet[str]
+
+    def __init_subclass__(cls, **kwargs):
+        """Build the new class's status tables and hooks."""
+        super().__init_subclass__(**kwargs)
+        cls._build_tables()
+
+    @classmethod
+    def _build_tables(cls):
+        """Build the status tables and hooks of the class and its subclasses.
+
+        This must be called again whenever a status method or hook is added to the
+        class after its definition, as class_decorator_factory does.
+        """
+        cls.status_table = {
+            status: _status_function(cls, status)
+            for status in status_list
+            if hasattr(cls, status)
+        }
+        for status, components in _derived_statuses.items():
+            functions = [
+                cls.status_table[x] for x in components if x in cls.status_table
+            ]
+            if status not in cls.status_table and functions:
+                cls.status_table[status] = _any_status(functions)
+
+        cls.registers_table = {
+            status: _status_function(cls, "registers_" + status)
+            for status in status_list
+            if hasattr(cls, "registers_" + status)
+        }
+
+        cls.hooks = frozenset(
+            hook
+            for hook in effect_hooks
+            if getattr(cls, hook) is not getattr(Effect, hook)
+        )
+
+        for subclass in cls.__subclasses__():
+            subclass._build_tables()
 
     def __init__(
         self, affected_player: "Player", source_player: "Player",
@@ -84,23 +207,12 @@ class Effect:
         if self.disabled:
             return False
 
-        assert status_name in status_list
-
         try:
-            return getattr(self, status_name)(game)
-
-        except AttributeError:
-            if status_name == "not_functioning":
-                return (
-                    self.status(game, "poisoned")
-                    or self.status(game, "drunk")
-                    or self.status(game, "dead")
-                )
-
-            if status_name == "safe_from_demon":
-                return self.status(game, "safe")
-
+            function = self.status_table[status_name]
+        except KeyError:
+            assert status_name in _status_set
             return False
+        return function(self, game)
 
     def registers_status(self, game: "Game", status_name: str) -> bool:
         """Determine whether the effect causes registering as a status.
@@ -120,8 +232,12 @@ class Effect:
         if self.disabled:
             return False
 
-        assert status_name in status_list
-        return getattr(self, "registers_" + status_name, lambda x: False)(game)
+        try:
+            function = self.registers_table[status_name]
+        except KeyError:
+            assert status_name in _status_set
+            return False
+        return function(self, game)
 
     def morning_cleanup(self, game: "Game"):
         """Call at the start of each day.
@@ -195,18 +311,23 @@ class Effect:
         originally_dead = self.affected_player.ghost(game)
 
         enabler_func()
+        game.invalidate_statuses()
 
         if originally_functioning and not self.affected_player.functioning(game):
 
             if not originally_dead and self.affected_player.ghost(game):
-                effect_list = [x for x in self.affected_player.source_effects(game)]
+                effect_list = game.effects_caused_by(
+                    self.affected_player, "source_death_cleanup"
+                )
                 for effect in effect_list:
                     # can't call it on self because of recursion errors
                     if not self == effect:
                         effect.source_death_cleanup(game)
 
             else:
-                effect_list = [x for x in self.affected_player.source_effects(game)]
+                effect_list = game.effects_caused_by(
+                    self.affected_player, "source_drunkpoisoned_cleanup"
+                )
                 for effect in effect_list:
                     if not self == effect:
                         effect.source_drunkpoisoned_cleanup(game)
@@ -232,6 +353,7 @@ class Effect:
             except ValueError:
                 pass
             # TODO: this is only a temp fix
+            game.unregister_effect(self)
 
         self.turn_off(game, disabler_func)
 
@@ -243,6 +365,7 @@ class Effect:
         originally_functioning = self.affected_player.functioning(game)
 
         disabler_func()
+        game.invalidate_statuses()
 
         if not originally_functioning and self.affected_player.functioning(game):
             effect_list = [x for x in self.affected_player.source_effects(game)]
@@ -256,6 +379,39 @@ class Effect:
         """
         pass
 
+    def to_state(self, writer: "StateWriter") -> Dict[str, Any]:
+        """Convert the effect to plain data.
+
+        Any attributes besides the players must be plain data, for instance the days
+        counter used by evening_delete.
+        """
+        attributes = deepcopy(
+            {
+                attribute: value
+                for attribute, value in self.__dict__.items()
+                if attribute not in ("affected_player", "source_player")
+            }
+        )
+        return {
+            "class": class_name(type(self)),
+            "source_player": writer.player(self.source_player),
+            "attributes": attributes,
+        }
+
+    @staticmethod
+    def from_state(
+        state: Dict[str, Any], affected_player: "Player", reader: "StateReader"
+    ) -> "Effect":
+        """Create an effect from plain data generated by to_state."""
+        effect = resolve_class(state["class"])(
+            affected_player, reader.player(state["source_player"])
+        )
+        effect.__dict__.update(state["attributes"])
+        return effect
+
+
+Effect._build_tables()
+
 
 # Some generic single-status effects that can be caused by storytellers
 class Drunk(Effect):
@@ -265,6 +421,7 @@ class Drunk(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def drunk(game: "Game") -> bool:
         """Determine whether the effect causes drunkenness."""
         return True
@@ -277,6 +434,7 @@ class Poisoned(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def poisoned(game: "Game") -> bool:
         """Determine whether the effect causes poisoning."""
         return True
@@ -289,6 +447,7 @@ class Dead(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def dead(game: "Game") -> bool:
         """Determine whether the effect causes death."""
         return True
@@ -301,6 +460,7 @@ class Safe(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def safe(game: "Game") -> bool:
         """Determine whether the effect causes safety."""
         return True
@@ -313,6 +473,7 @@ class SafeFromDemon(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def safe_from_demon(game: "Game") -> bool:
         """Determine whether the effect causes safety from the Demon."""
         return True
@@ -325,6 +486,7 @@ class UsedAbility(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def used_ability(game: "Game") -> bool:
         """Determine whether the effect causes the ability to be used."""
         return True
@@ -337,6 +499,7 @@ class NoDeadVoteNeeded(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def can_dead_vote_without_token(game: "Game") -> bool:
         """Determine whether the effect allows dead voting without a token."""
         return True
@@ -351,6 +514,7 @@ class Good(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def good(game: "Game") -> bool:
         """Determine whether the effect makes the player good."""
         return True
@@ -364,6 +528,7 @@ class Evil(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def evil(game: "Game") -> bool:
         """Determine whether the effect makes the player evil."""
         return True
@@ -377,6 +542,7 @@ class TownsfolkEffect(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def townsfolk(game: "Game") -> bool:
         """Determine whether the effect makes the player a townsfolk."""
         return True
@@ -390,6 +556,7 @@ class OutsiderEffect(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def outsider(game: "Game") -> bool:
         """Determine whether the effect makes the player an outsider."""
         return True
@@ -403,6 +570,7 @@ class MinionEffect(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def minion(game: "Game") -> bool:
         """Determine whether the effect makes the player a minion."""
         return True
@@ -416,6 +584,7 @@ class DemonEffect(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def demon(game: "Game") -> bool:
         """Determine whether the effect makes the player a demon."""
         return True
@@ -429,6 +598,7 @@ class TravelerEffect(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def traveler(game: "Game") -> bool:
         """Determine whether the effect makes the player a traveler."""
         return True
@@ -442,6 +612,7 @@ class StorytellerEffect(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def storyteller(game: "Game") -> bool:
         """Determine whether the effect makes the player a storyteller."""
         return True
@@ -454,6 +625,7 @@ class RegistersGood(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def registers_good(game: "Game"):
         """Determine whether the effect makes the player register as good."""
         return True
@@ -466,6 +638,7 @@ class RegistersEvil(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def registers_evil(game: "Game"):
         """Determine whether the effect makes the player register as evil."""
         return True
@@ -478,6 +651,7 @@ class RegistersTownsfolk(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def registers_townsfolk(game: "Game"):
         """Determine whether the effect makes the player register as a townsfolk."""
         return True
@@ -490,6 +664,7 @@ class RegistersOutsider(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def registers_outsider(game: "Game"):
         """Determine whether the effect makes the player register as an outsider."""
         return True
@@ -502,6 +677,7 @@ class RegistersMinion(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def registers_minion(game: "Game"):
         """Determine whether the effect makes the player register as a minion."""
         return True
@@ -514,6 +690,7 @@ class RegistersDemon(Effect):
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @_unconditional
     def registers_demon(game: "Game"):
         """Determine whether the effect makes the player register as a demon."""
         return True
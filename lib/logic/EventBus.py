@@ -0,0 +1,67 @@
+"""Contains the EventBus class."""
+
+from itertools import count
+from typing import Dict, Iterator, Tuple, Union
+
+from lib.logic.Character import Character
+from lib.logic.Effect import Effect
+
+Subscriber = Union[Character, Effect]
+
+
+def _seat(subscriber: Subscriber) -> Tuple[int, int]:
+    """Determine where a subscriber is dispatched: by seat, characters first."""
+    if isinstance(subscriber, Character):
+        return subscriber.parent.position, 0
+    return subscriber.affected_player.position, 1
+
+
+class EventBus:
+    """Dispatches game events to the characters and effects which handle them.
+
+    Subscribers are grouped by class, and a class handles exactly the hooks it
+    overrides (its hooks attribute). Hooks are looked up at dispatch time, so classes
+    decorated after their instances subscribed are still dispatched to correctly.
+    """
+
+    def __init__(self):
+        self._by_class = {}  # type: Dict[type, Dict[int, Tuple[int, Subscriber]]]
+        self._order = count()
+
+    def subscribe(self, subscriber: Subscriber):
+        """Dispatch events to a character or effect."""
+        self._by_class.setdefault(type(subscriber), {})[id(subscriber)] = (
+            next(self._order),
+            subscriber,
+        )
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Stop dispatching events to a character or effect."""
+        self._by_class.get(type(subscriber), {}).pop(id(subscriber), None)
+
+    def subscribers(self, hook: str) -> Iterator[Subscriber]:
+        """Iterate over the subscribers which handle a hook.
+
+        Parameters
+        ----------
+        hook : str
+            The hook, for instance "nomination".
+
+        Yields
+        ------
+        Subscriber
+            The subscribers, in seating order, with each player's character before
+            their effects in the order they were added. The order is fixed when
+            iteration starts, but subscribers which unsubscribe (for instance effects
+            deleted by an earlier subscriber) are skipped.
+        """
+        found = [
+            entry
+            for cls, entries in self._by_class.items()
+            if hook in cls.hooks
+            for entry in entries.values()
+        ]
+        found.sort(key=lambda entry: (_seat(entry[1]), entry[0]))
+        for _, subscriber in found:
+            if id(subscriber) in self._by_class.get(type(subscriber), {}):
+                yield subscriber
@@ -1,19 +1,32 @@
 """Contains the Game class."""
 
-from typing import TYPE_CHECKING, List, Optional
+from itertools import count
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from discord import Message
 from discord.ext import commands
 
+from lib.exceptions import PlayerNotFoundError
+from lib.logic.Character import Character
 from lib.logic.Day import Day
+from lib.logic.Effect import Effect
+from lib.logic.EventBus import EventBus
+from lib.logic.MessageCache import MessageCache
 from lib.logic.Night import Night
+from lib.logic.PinRegistry import PinRegistry
 from lib.logic.Player import Player
+from lib.logic.Script import Script
+from lib.logic.SeatingRing import SeatingRing
+from lib.logic.StatusEvaluator import StatusEvaluator
 from lib.logic.tools import generate_game_info_message
+from lib.state import StateReader, StateWriter
 
 if TYPE_CHECKING:
-    from lib.logic.Script import Script
     from lib.typings.context import GameContext, DayContext
 
+# unique across games, so a player's cache can never match a different game
+_status_generations = count()
+
 
 class Game:
     """Stores information about a game.
@@ -35,10 +48,30 @@ class Game:
         The game's previous days.
     current_day : Optional[Day]
         The game's currently active day, or None.
+    seating : SeatingRing
+        The seating order, with player positions and neighbors.
+    status_generation : int
+        Identifies the current state of every effect in the game. Players memoize
+        is_status results until it changes; see invalidate_statuses.
+    status_evaluator : StatusEvaluator
+        Detects and resolves cycles between statuses.
+    events : EventBus
+        Dispatches nominations and cleanup to the characters and effects of seated
+        players which handle them.
+    pins : PinRegistry
+        The messages the bot has pinned this game.
+    message_cache : MessageCache
+        The metadata of the bot's recent messages in the gameplay channel.
     seating_order
     seating_order_message
     script
     storytellers
+
+    Notes
+    -----
+    Players are indexed by member id for get_player, so modify the seating order and
+    storyteller list only by assigning to them or with reseat, add_traveler,
+    remove_traveler and add_storyteller, never in place.
     """
 
     def __init__(
@@ -52,19 +85,230 @@ class Game:
         self.current_day = None  # type: Optional[Day]
         self.past_nights = []  # type: List[Night]
         self.current_night = None  # type: Optional[Night]
+        self.status_generation = next(_status_generations)
+        self.status_evaluator = StatusEvaluator()
+        self.pins = PinRegistry()
+        self.message_cache = MessageCache()
         self.seating_order = seating_order
         self.seating_order_message = seating_order_message
         self.script = script
         self.storytellers = storytellers
 
-    def __getstate__(self) -> dict:
-        """Cleanup when pickled."""
-        state = self.__dict__.copy()
-        state[
-            "seating_order_message"
-        ] = self.seating_order_message.id  # discord snowflake objects are not picklable
+    def __setstate__(self, state: dict):
+        """Restore a game pickled before the state format, rebuilding its indices."""
+        seating_order = state.pop("seating_order")
+        storytellers = state.pop("storytellers")
+        self.__dict__.update(state)
+        self.pins = PinRegistry(complete=False)
+        self.message_cache = MessageCache()
+        self.status_generation = next(_status_generations)
+        self.status_evaluator = StatusEvaluator()
+        self.seating_order = seating_order
+        self.storytellers = storytellers
+
+    @property
+    def seating_order(self) -> List[Player]:
+        """Determine the game's players, in order."""
+        return self.seating.players
+
+    @seating_order.setter
+    def seating_order(self, value: List[Player]):
+        self.seating = SeatingRing(value)
+        self._player_index = {player.id: player for player in value}
+        self._source_index = {}  # type: Dict[Optional[int], Dict[int, Effect]]
+        self.events = EventBus()
+        for player in value:
+            self.register_character(player.character)
+            for effect in player.effects:
+                self.register_effect(effect)
+
+    @property
+    def storytellers(self) -> List[Player]:
+        """Determine the game's storytellers."""
+        return self._storytellers
+
+    @storytellers.setter
+    def storytellers(self, value: List[Player]):
+        self._storytellers = value
+        self._storyteller_index = {st.id: st for st in value}
+
+    def get_player(self, idn: int, include_storytellers: bool = True) -> Player:
+        """Find the player with a member id.
+
+        Parameters
+        ----------
+        idn : int
+            The player's member's discord ID.
+        include_storytellers : bool
+            Whether to search the storytellers as well. Storytellers take precedence.
+
+        Returns
+        -------
+        Player
+            The matching player.
+
+        Raises
+        ------
+        PlayerNotFoundError
+            If no matching player is found.
+        """
+        if include_storytellers and idn in self._storyteller_index:
+            return self._storyteller_index[idn]
+        try:
+            return self._player_index[idn]
+        except KeyError:
+            raise PlayerNotFoundError
+
+    def add_traveler(self, traveler: Player):
+        """Seat a traveler at their position."""
+        self.seating.insert(traveler.position, traveler)
+        self._player_index[traveler.id] = traveler
+        self.register_character(traveler.character)
+        for effect in traveler.effects:
+            self.register_effect(effect)
+
+    def remove_traveler(self, traveler: Player):
+        """Remove a traveler from the seating order."""
+        self.seating.remove(traveler)
+        del self._player_index[traveler.id]
+        self.unregister_character(traveler.character)
+        for effect in traveler.effects:
+            self.unregister_effect(effect)
+
+    def register_character(self, character: Character):
+        """Subscribe a seated player's new character to game events."""
+        if character.parent in self.seating:
+            self.events.subscribe(character)
+
+    def unregister_character(self, character: Character):
+        """Unsubscribe a replaced character from game events."""
+        self.events.unsubscribe(character)
+
+    def register_effect(self, effect: Effect):
+        """Index a newly added effect by its source and subscribe it to game events.
+
+        Effects on players outside the seating order, like storytellers, are not
+        indexed.
+        """
+        if effect.affected_player in self.seating:
+            source_id = getattr(effect.source_player, "id", None)
+            self._source_index.setdefault(source_id, {})[id(effect)] = effect
+            self.events.subscribe(effect)
+
+    def unregister_effect(self, effect: Effect):
+        """Remove a deleted effect from the index and from game events."""
+        source_id = getattr(effect.source_player, "id", None)
+        self._source_index.get(source_id, {}).pop(id(effect), None)
+        self.events.unsubscribe(effect)
+
+    def effects_caused_by(
+        self, source: Player, hook: Optional[str] = None
+    ) -> List[Effect]:
+        """Determine the effects on seated players whose source is source.
+
+        Disabled effects are included. The list is a copy, so the effects may be
+        deleted while iterating over it.
+
+        Parameters
+        ----------
+        source : Player
+            The source.
+        hook : Optional[str]
+            If given, only effects which handle this hook (see Effect.hooks).
+
+        Returns
+        -------
+        List[Effect]
+            The effects.
+        """
+        effects = self._source_index.get(source.id, {}).values()
+        if hook is None:
+            return list(effects)
+        return [effect for effect in effects if hook in effect.hooks]
+
+    def invalidate_statuses(self):
+        """Forget every memoized status, because an effect changed.
+
+        Statuses can depend on other players' effects (for instance the Vigormortis's
+        kill depends on whether the Vigormortis is functioning), so every player's
+        cache is flushed rather than only the affected player's.
+        """
+        self.status_generation = next(_status_generations)
+
+    def add_storyteller(self, storyteller: Player):
+        """Add a storyteller."""
+        self._storytellers.append(storyteller)
+        self._storyteller_index[storyteller.id] = storyteller
+
+    def live_state(self, writer: StateWriter) -> Dict[str, Any]:
+        """Convert the game's mutable working set to plain data.
+
+        This excludes the append-only history (past days and nights and message
+        histories), the script, which never changes mid-game, and the message cache,
+        which is rebuilt by fetching messages as they are needed.
+        """
+        return {
+            "seating_order": [writer.player(x) for x in self.seating_order],
+            "storytellers": [writer.player(x) for x in self.storytellers],
+            "seating_order_message": getattr(
+                self.seating_order_message, "id", self.seating_order_message
+            ),
+            "current_day": self.current_day and self.current_day.to_state(writer),
+            "current_night": self.current_night
+            and self.current_night.to_state(writer),
+            "winner": getattr(self, "winner", None),
+            "pins": self.pins.to_state(),
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        """Convert the game to plain data.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The state. "players" holds every player referenced anywhere in the game,
+            including travelers who have since left, and "messages" holds every message
+            history entry exactly once; players and messages are referenced elsewhere
+            by id and by index respectively.
+        """
+        writer = StateWriter()
+        state = {
+            "live": self.live_state(writer),
+            "past_days": [day.to_state(writer) for day in self.past_days],
+            "past_nights": [night.to_state(writer) for night in self.past_nights],
+            "script": self.script.to_state(),
+        }
+        state["players"], state["histories"] = writer.finish(histories=True)
+        state["messages"] = writer.messages
         return state
 
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Game":
+        """Create a game from plain data generated by to_state.
+
+        Player members and the seating order message are left as ids, to be resolved
+        once the bot is connected.
+        """
+        reader = StateReader(state["players"], state["messages"], state["histories"])
+        live = state["live"]
+
+        game = cls(
+            [reader.player(idn) for idn in live["seating_order"]],
+            live["seating_order_message"],
+            Script.from_state(state["script"]),
+            [reader.player(idn) for idn in live["storytellers"]],
+        )
+        game.past_days = [Day.from_state(x, reader) for x in state["past_days"]]
+        game.past_nights = [Night.from_state(x, reader) for x in state["past_nights"]]
+        if live["current_day"] is not None:
+            game.current_day = Day.from_state(live["current_day"], reader)
+        if live["current_night"] is not None:
+            game.current_night = Night.from_state(live["current_night"], reader)
+        if live["winner"] is not None:
+            game.winner = live["winner"]
+        game.pins = PinRegistry.from_state(live.get("pins"))
+        return game
+
     @property
     def day_number(self) -> int:
         """Determine the current day number."""
@@ -75,6 +319,32 @@ class Game:
         """Determine the players who have not spoken today."""
         return [player for player in self.seating_order if not player.has_spoken]
 
+    def players_with(
+        self, statuses: int, without: int = 0, registers: bool = False
+    ) -> List[Player]:
+        """Determine the players affected by some statuses and not by others.
+
+        Parameters
+        ----------
+        statuses : int
+            The statuses the players must all have, as a mask over Status.
+        without : int
+            The statuses the players must not have, as a mask over Status.
+        registers : bool
+            Whether to check registering as the statuses, or having them.
+
+        Returns
+        -------
+        List[Player]
+            The matching players, in seating order. For instance,
+            players_with(Status.minion, without=Status.dead) finds the living minions.
+        """
+        return [
+            player
+            for player in self.seating_order
+            if player.status_mask(self, statuses | without, registers) == statuses
+        ]
+
     @property
     def to_nominate(self) -> List[Player]:
         """Determine the players who have not spoken today."""
@@ -105,8 +375,15 @@ class Game:
             content=generate_game_info_message(new_seating_order, ctx.bot.game)
         )
 
-        # Update seating order
-        self.seating_order = new_seating_order
+        # Update seating order, rebuilding the indices only if the players changed. This
+        # runs after every command, almost always with the current order.
+        old_seating_order = self.seating_order
+        if all(old is new for old, new in zip(old_seating_order, new_seating_order)):
+            return
+        if {id(x) for x in old_seating_order} == {id(x) for x in new_seating_order}:
+            self.seating = SeatingRing(new_seating_order)
+        else:
+            self.seating_order = new_seating_order
 
     async def start_night(self, ctx: "DayContext"):
         """Start a new night."""
@@ -0,0 +1,73 @@
+"""Contains the MessageCache class."""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import NamedTuple
+
+from discord import Message, TextChannel
+
+# The number of messages to remember.
+_CAPACITY = 256
+
+
+class CachedMessage(NamedTuple):
+    """The metadata of one of the bot's messages in the gameplay channel."""
+
+    id: int
+    created_at: datetime
+    content: str
+
+
+class MessageCache:
+    """Remembers the metadata of the bot's recent messages in the gameplay channel.
+
+    The bot records its messages as it sends and sees them, so looking one up by id
+    later doesn't need a round-trip to fetch it. Only the most recent messages are
+    kept; a miss falls back to fetching the message.
+
+    The cache isn't backed up, since it changes with every message the bot sends. A
+    restored game starts with an empty cache, which refills as messages are fetched.
+
+    Parameters
+    ----------
+    capacity : int
+        The number of messages to remember.
+    """
+
+    def __init__(self, capacity: int = _CAPACITY):
+        self.capacity = capacity
+        self._messages = OrderedDict()  # type: OrderedDict[int, CachedMessage]
+
+    def __contains__(self, idn: int) -> bool:
+        """Determine whether a message is cached, by id."""
+        return idn in self._messages
+
+    def record(self, message: Message) -> CachedMessage:
+        """Remember a message, or update a message which was edited."""
+        out = CachedMessage(message.id, message.created_at, message.content)
+        self._messages[message.id] = out
+        self._messages.move_to_end(message.id)
+        while len(self._messages) > self.capacity:
+            self._messages.popitem(last=False)
+        return out
+
+    async def get(self, channel: TextChannel, idn: int) -> CachedMessage:
+        """Look a message up by id, fetching it if it isn't cached.
+
+        Raises
+        ------
+        discord.NotFound
+            If the message is not cached and does not exist.
+        """
+        try:
+            return self._messages[idn]
+        except KeyError:
+            return self.record(await channel.fetch_message(idn))
+
+    async def edit(self, channel: TextChannel, idn: int, content: str):
+        """Edit one of the bot's messages by id, without fetching it first."""
+        message = await channel.get_partial_message(idn).edit(content=content)
+        if message is not None:
+            self.record(message)
+        elif idn in self._messages:
+            self._messages[idn] = self._messages[idn]._replace(content=content)
@@ -1,32 +1,28 @@
 """Contains the Night class."""
 from random import shuffle
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 from lib.abc import NightOrderMember
 from lib.exceptions import InvalidMorningTargetError
+from lib.logic.Character import Character
 from lib.logic.Day import Day
+from lib.logic.Effect import Status
+from lib.state import class_name, resolve_class
 from lib.utils import list_to_plural_string, safe_bug_report, safe_send
 
 if TYPE_CHECKING:
     from lib.logic.Player import Player
     from lib.logic.Game import Game
+    from lib.state import StateReader, StateWriter
     from lib.typings.context import GameContext
 
 
 def _get_minion_demon_text(
     ctx: "GameContext",
 ) -> Tuple[Tuple[str, bool], Tuple[str, bool]]:
-    minions = [
-        player.nick
-        for player in ctx.bot.game.seating_order
-        if player.is_status(ctx.bot.game, "minion")
-    ]
+    minions = [player.nick for player in ctx.bot.game.players_with(Status.minion)]
     minion_text = list_to_plural_string(minions, "")
-    demons = [
-        player.nick
-        for player in ctx.bot.game.seating_order
-        if player.is_status(ctx.bot.game, "demon")
-    ]
+    demons = [player.nick for player in ctx.bot.game.players_with(Status.demon)]
     demon_text = list_to_plural_string(demons, "no one")
     return minion_text, demon_text
 
@@ -77,19 +73,50 @@ class Night:
         self._kills: List["Player"] = []
         self._messages: List[str] = []
 
+    def to_state(self, writer: "StateWriter") -> Dict[str, Any]:
+        """Convert the night to plain data.
+
+        Characters in the night order are referenced by their player; the other steps,
+        like minion info, are stateless and referenced by class.
+        """
+        return {
+            "step": self._step,
+            "order": [
+                {"player": writer.player(x.parent)}
+                if isinstance(x, Character)
+                else {"class": class_name(type(x))}
+                for x in self._order
+            ],
+            "kills": [writer.player(x) for x in self._kills],
+            "messages": list(self._messages),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], reader: "StateReader") -> "Night":
+        """Create a night from plain data generated by to_state."""
+        night = cls.__new__(cls)
+        night._step = state["step"]
+        night._order = [
+            reader.player(x["player"]).character
+            if "player" in x
+            else resolve_class(x["class"])()
+            for x in state["order"]
+        ]
+        night._kills = [reader.player(idn) for idn in state["kills"]]
+        night._messages = state["messages"]
+        return night
+
     def _set_order(self, game: "Game"):
         if game.day_number == 0:
-            night_order = game.script.first_night
+            ranks = game.script.compiled.first_night_ranks
         else:
-            night_order = game.script.other_nights
+            ranks = game.script.compiled.other_night_ranks
         relevant_characters = [
             player.character
             for player in game.seating_order
-            if type(player.character) in night_order and not player.ghost(game)
+            if type(player.character) in ranks and not player.ghost(game)
         ]
-        relevant_characters = sorted(
-            relevant_characters, key=lambda x: night_order.index(type(x))
-        )
+        relevant_characters.sort(key=lambda x: ranks[type(x)])
         self._order = relevant_characters + [_NightEnd()]  # type: ignore
         if game.day_number == 0:
             self._order = [_MinionInfo(), _DemonInfo()] + self._order
@@ -128,16 +155,15 @@ class Night:
 
     async def _end(self, ctx: "GameContext"):
         for player in ctx.bot.game.seating_order:
-            player.morning(ctx.bot.inactive_role)
-            effect_list = [x for x in player.effects]
-            for effect in effect_list:
-                effect.morning_cleanup(ctx)
+            player.morning(ctx.bot.is_inactive(player.member))
+        for effect in ctx.bot.game.events.subscribers("morning_cleanup"):
+            effect.morning_cleanup(ctx.bot.game)
 
         # announcements
         # kills
         shuffle(self._kills)
         text = list_to_plural_string([x.nick for x in self._kills], alt="No one")
-        await safe_send(
+        await ctx.bot.outbox.announce(
             ctx.bot.channel,
             "{text} {verb} died.".format(text=text[0], verb=("has", "have")[text[1]]),
         )
@@ -145,10 +171,10 @@ class Night:
         # other
         for content in self._messages:
             if content:
-                await safe_send(ctx.bot.channel, content, pin=True)
+                await ctx.bot.outbox.announce(ctx.bot.channel, content, pin=True)
 
         # start day
-        await safe_send(
+        await ctx.bot.outbox.announce(
             ctx.bot.channel,
             f"{ctx.bot.player_role.mention}, wake up!",
             pin=bool(self._kills),
@@ -0,0 +1,141 @@
+"""Contains the PinRegistry class."""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from discord import HTTPException, Message, NotFound, TextChannel
+
+# The maximum number of pins in a channel.
+PIN_LIMIT = 50
+
+# The error code Discord responds with when a channel is out of pins.
+_PIN_LIMIT_REACHED = 30003
+
+# The number of concurrent unpin requests, to stay within the channel's rate limit.
+_UNPIN_CONCURRENCY = 5
+
+
+class PinRegistry:
+    """Records which messages the bot pinned during a game, and when.
+
+    Knowing what is pinned means unpinning never needs to fetch a message to check,
+    and the pin limit can be seen coming rather than hit mid-vote.
+
+    Parameters
+    ----------
+    external : int
+        The number of messages pinned in the channel by anyone but the bot, as last
+        counted.
+    complete : bool
+        Whether every pin the bot made this game is recorded. False for games restored
+        from backups made before pins were recorded.
+
+    Attributes
+    ----------
+    pinned : Dict[int, datetime]
+        The ids of the messages the bot pinned, with the times they were pinned.
+    external
+    complete
+    """
+
+    def __init__(self, external: int = 0, complete: bool = True):
+        self.external = external
+        self.complete = complete
+        self.pinned = {}  # type: Dict[int, datetime]
+
+    def __len__(self) -> int:
+        """Determine the number of messages pinned in the channel."""
+        return self.external + len(self.pinned)
+
+    def __contains__(self, idn: int) -> bool:
+        """Determine whether the bot pinned a message, by id."""
+        return idn in self.pinned
+
+    @property
+    def remaining(self) -> int:
+        """Determine the number of messages which can still be pinned."""
+        return max(PIN_LIMIT - len(self), 0)
+
+    async def pin(self, message: Message) -> bool:
+        """Pin a message, unless the channel is out of pins.
+
+        Messages pinned by hand mid-game aren't counted in external, so Discord may
+        still refuse the pin. Then external is recounted and the message isn't pinned.
+
+        Returns
+        -------
+        bool
+            Whether the message was pinned.
+        """
+        if not self.remaining:
+            return False
+        try:
+            await message.pin()
+        except HTTPException as e:
+            if e.code != _PIN_LIMIT_REACHED:
+                raise
+            # someone else pinned messages since external was counted
+            await self.resync(message.channel)
+            return False
+        self.pinned[message.id] = datetime.utcnow()
+        return True
+
+    async def resync(self, channel: TextChannel):
+        """Recount the messages pinned in the channel by anyone but the bot."""
+        pins = await channel.pins()
+        self.external = len([x for x in pins if x.id not in self.pinned])
+
+    async def unpin(self, channel: TextChannel, ids: Iterable[int]):
+        """Unpin messages by id, concurrently, skipping any the bot didn't pin.
+
+        If the registry is incomplete, every message is unpinned, since the bot may
+        have pinned it before pins were recorded. Messages which have since been
+        deleted or unpinned by hand are forgotten.
+
+        Raises
+        ------
+        Exception
+            The first error unpinning a message, once every message has been tried.
+        """
+        ids = [idn for idn in ids if idn in self.pinned or not self.complete]
+        semaphore = asyncio.Semaphore(_UNPIN_CONCURRENCY)
+
+        async def _unpin(idn: int):
+            async with semaphore:
+                try:
+                    await channel.get_partial_message(idn).unpin()
+                except NotFound:
+                    pass
+                self.pinned.pop(idn, None)
+
+        results = await asyncio.gather(
+            *(_unpin(idn) for idn in ids), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def unpin_all(self, channel: TextChannel):
+        """Unpin every message the bot pinned, concurrently."""
+        await self.unpin(channel, list(self.pinned))
+
+    def to_state(self) -> Dict[str, Any]:
+        """Convert the registry to plain data."""
+        return {
+            "external": self.external,
+            "complete": self.complete,
+            "pinned": dict(self.pinned),
+        }
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, Any]]) -> "PinRegistry":
+        """Create a registry from plain data generated by to_state.
+
+        A state from before pins were recorded gives an incomplete registry.
+        """
+        if state is None:
+            return cls(complete=False)
+        out = cls(state["external"], state["complete"])
+        out.pinned = dict(state["pinned"])
+        return out
@@ -2,60 +2,53 @@
 
 import traceback
 import typing
+from copy import deepcopy
 from typing import Optional
 
-from discord import Member, Role
+from discord import Member, Message
 from discord.ext import commands
 
-from lib.logic.Effect import Dead, Effect, Evil, Good
+from lib.logic.Effect import (Dead, Effect, Evil, Good, Status, status_bits,
+                              status_names)
 from lib.preferences import load_preferences
-from lib.utils import get_input, safe_bug_report, safe_send
+from lib.state import class_name, resolve_class
+from lib.utils import get_input, safe_bug_report, safe_send, safe_send_all
 
 if typing.TYPE_CHECKING:
+    from lib.bot import BOTCBot
     from lib.logic.Character import Character
     from lib.logic.Game import Game
+    from lib.state import StateReader, StateWriter
     from lib.typings.context import GameContext, DayContext
 
 
-def _get_neighbor(
-    game: "Game",
-    condition: typing.Callable[["Player", "Game"], bool],
-    order: typing.List["Player"],
-) -> typing.Optional["Player"]:
-    """Determine the first player in _order matching condition."""
-    out = None
-    for player in order:
-        if condition(player, game):
-            out = player
-            break
-    return out
-
-
 class _UpdateUnnecessaryError(Exception):
     """An update to player activity was unnecessary."""
 
     pass
 
 
-async def _update_activity(
-    game: "Game",
+def _update_activity(
+    bot: "BOTCBot",
     updater_func: typing.Callable[["Game"], typing.List["Player"]],
     zero_string: str,
     one_string: str,
 ):
-    """Update a player's activity."""
+    """Update a player's activity, notifying the storytellers in the background."""
     try:
-        player_list = updater_func(game)
+        player_list = updater_func(bot.game)
     except _UpdateUnnecessaryError:
         return
 
     if len(player_list) == 0:
-        for st in game.storytellers:
-            await safe_send(st.member, f"Everyone has {zero_string}!")
+        for st in bot.game.storytellers:
+            bot.outbox.notify(st.member, f"Everyone has {zero_string}!")
 
     elif len(player_list) == 1:
-        for st in game.storytellers:
-            await safe_send(st.member, f"Just {player_list[0].nick} to {one_string}.")
+        for st in bot.game.storytellers:
+            bot.outbox.notify(
+                st.member, f"Just {player_list[0].nick} to {one_string}."
+            )
 
 
 class Player:
@@ -68,7 +61,7 @@ class Player:
     character : Type[Character]
         The player's character.
     position : Optional[int]
-        The player's position in the seating order.
+        The player's position in the seating order, kept up to date by Game.seating.
 
     Attributes
     ----------
@@ -102,6 +95,14 @@ class Player:
     character: "Character"
     message_history: typing.List[typing.Dict[str, typing.Any]]
 
+    # memoized statuses, as masks over Status, valid while _status_generation is
+    # current: which bits are known, and their values, with and without registering
+    _status_generation: typing.Optional[int] = None
+    _has_known = 0
+    _has_values = 0
+    _registers_known = 0
+    _registers_values = 0
+
     def __init__(
         self,
         member: Member,
@@ -139,24 +140,11 @@ class Player:
         typing.Tuple["Player", "Player"]
             The upwards neighbor and the downwards neighbor satisfying condition.
         """
-        seating_order_excluding_self = (
-            # flake8: noqa
-            # (this is a false positive), the space is black-enforced
-            game.seating_order[self.position + 1 :]
-            + game.seating_order[: self.position]
-        )
-        out1 = _get_neighbor(game, condition, seating_order_excluding_self[::-1])
-        out2 = _get_neighbor(game, condition, seating_order_excluding_self)
-        return out1, out2
-
-    def source_effects(
-        self, game: "Game"
-    ) -> typing.Generator["Effect", typing.Any, typing.Any]:
-        """Yield all effects for which the player is the source."""
-        for player in game.seating_order:
-            for effect in player.effects:
-                if effect.source_player == self:
-                    yield effect
+        return game.seating.neighbors(self, game, condition)
+
+    def source_effects(self, game: "Game") -> typing.List["Effect"]:
+        """Determine all effects for which the player is the source."""
+        return game.effects_caused_by(self)
 
     # Aliases for is_status and registers_status and related
     def ghost(self, game: "Game", registers: bool = False) -> bool:
@@ -201,9 +189,10 @@ class Player:
         if traveler:
             return 1
         multiplier = 1
-        if self.is_status(game, "thiefed"):
+        statuses = self.status_mask(game, Status.thiefed | Status.bureaucrated)
+        if statuses & Status.thiefed:
             multiplier *= -1
-        if self.is_status(game, "bureaucrated"):
+        if statuses & Status.bureaucrated:
             multiplier *= -3
         return multiplier
 
@@ -226,28 +215,85 @@ class Player:
         -------
         bool
             Whether they have (or register as) the status.
+
+        Notes
+        -----
+        Results are memoized until game.status_generation changes. Statuses which
+        depend on themselves are resolved by game.status_evaluator.
         """
-        try:
+        assert status_name in status_bits
+        return bool(self.status_mask(game, status_bits[status_name], registers))
+
+    def status_mask(self, game: "Game", statuses: int, registers: bool = False) -> int:
+        """Determine which of several statuses affect the player.
+
+        Parameters
+        ----------
+        game : Game
+            The current game.
+        statuses : int
+            The statuses to check, as a mask over Status.
+        registers : bool
+            Whether to check if they register as the statuses, or have them.
+
+        Returns
+        -------
+        int
+            The statuses which the player has (or registers as), as a mask.
+        """
+        if self._status_generation != game.status_generation:
+            self._status_generation = game.status_generation
+            self._has_known = self._has_values = 0
+            self._registers_known = self._registers_values = 0
+
+        statuses = int(statuses)
+        if registers:
+            out = self._registers_values & statuses
+            unknown = statuses & ~self._registers_known
+        else:
+            out = self._has_values & statuses
+            unknown = statuses & ~self._has_known
+
+        while unknown:
+            bit = unknown & -unknown
+            unknown ^= bit
+            status_name = status_names[bit]
+            try:
+                value, final = game.status_evaluator.evaluate(
+                    (self.id, bit, registers),
+                    lambda: self._evaluate_status(game, status_name, registers),
+                )
+            except RecursionError:
+                print(
+                    (
+                        "Hit a recursion error while determining "
+                        f"whether {self.nick} is {status_name}.",
+                    ),
+                )
+                traceback.print_exc()
+                out |= bit
+                continue
+
+            if value:
+                out |= bit
+            if not final:  # provisional, because of a cycle between statuses
+                continue
             if registers:
-                for effect in self.effects:
-                    if effect.registers_status(game, status_name):
-                        return True
-
-            for effect in self.effects:
-                if effect.status(game, status_name):
-                    return True
-
-            return False
-
-        except RecursionError:
-            print(
-                (
-                    "Hit a recursion error while determining "
-                    f"whether {self.nick} is {status_name}.",
-                ),
-            )
-            traceback.print_exc()
-            return True
+                self._registers_known |= bit
+                self._registers_values |= bit if value else 0
+            else:
+                self._has_known |= bit
+                self._has_values |= bit if value else 0
+
+        return out
+
+    def _evaluate_status(self, game: "Game", status_name: str, registers: bool) -> bool:
+        """Determine whether the player is affected by a status, from their effects."""
+        if registers:
+            return any(
+                effect.registers_status(game, status_name) for effect in self.effects
+            ) or self.is_status(game, status_name)
+        return any(effect.status(game, status_name) for effect in self.effects)
 
     def exclusive_status_search(
         self, game: "Game", statuses: typing.List[str]
@@ -268,8 +314,9 @@ class Player:
         Optional[str]
             The matching status, or None.
         """
+        mask = self.status_mask(game, sum(status_bits[x] for x in statuses))
         for status in statuses:
-            if self.is_status(game, status):
+            if mask & status_bits[status]:
                 return status
         return None
 
@@ -304,15 +351,17 @@ class Player:
         return message_text
 
     # Gameplay Methods
-    def morning(self, inactive_role: Role):
+    def morning(self, inactive: bool):
         """Handle basic cleanup at the beginning of the day.
 
         Called by Game.startday.
+
+        Parameters
+        ----------
+        inactive : bool
+            Whether the player has the inactive role.
         """
-        if self.member in inactive_role.members:
-            self.is_inactive = True
-        else:
-            self.is_inactive = False
+        self.is_inactive = inactive
         self.nominations_today = 0
         self.has_been_nominated = False
         self.has_spoken = self.is_inactive
@@ -334,47 +383,37 @@ class Player:
             ctx, f"Messaging {self.nick}. What would you like to send?"
         )
 
-        # messages to storytellers
-        if self.is_status(ctx.bot.game, "storyteller"):
-            for st in ctx.bot.game.storytellers:
-                message = await safe_send(
-                    st.member,
-                    (
-                        f"{st.member.mention}, message from {frm.nick} to "
-                        f"storyteller {self.nick}: **{content}**"
-                    ),
-                )  # STs get the
-                # bolded message for a message to any ST
-
-            for observer in ctx.bot.observer_role.members:
-                await safe_send(
-                    observer, f"**[**{frm.nick} **>** {self.nick}**]** {content}",
-                )
+        report = f"**[**{frm.nick} **>** {self.nick}**]** {content}"
 
-        # other messages
+        # the recipient's copy
+        to_storytellers = self.is_status(ctx.bot.game, "storyteller")
+        if to_storytellers:
+            # STs get the bolded message for a message to any ST
+            copies = await safe_send_all(
+                ctx.bot,
+                [
+                    (
+                        st.member,
+                        (
+                            f"{st.member.mention}, message from {frm.nick} to "
+                            f"storyteller {self.nick}: **{content}**"
+                        ),
+                    )
+                    for st in ctx.bot.game.storytellers
+                ],
+            )
+            delivered = [x for x in copies if isinstance(x, Message)]
+            if not delivered:
+                if copies:
+                    raise copies[0]
+                raise commands.BadArgument("There are no storytellers to message.")
+            message = delivered[0]
         else:
             message = await safe_send(
                 self.member, f"Message from {frm.nick}: **{content}**",
             )
 
-            # inform sts and observers
-            for st in ctx.bot.game.storytellers:
-                await safe_send(
-                    st.member, f"**[**{frm.nick} **>** {self.nick}**]** {content}",
-                )
-
-            for observer in ctx.bot.observer_role.members:
-                await safe_send(
-                    observer, f"**[**{frm.nick} **>** {self.nick}**]** {content}",
-                )
-
-        # public report
-        if ctx.bot.instant_message_reporting:
-            await safe_send(ctx.bot.channel, f"**{frm.nick}** > **{self.nick}**")
-
         # update message histories
-        # noinspection PyUnboundLocalVariable
-        # think this is a false positive
         message_dict = {
             "from": frm,
             "to": self,
@@ -384,11 +423,20 @@ class Player:
         }
         self.message_history.append(message_dict)
         frm.message_history.append(message_dict)
+        await frm.make_active(ctx.bot)
 
-        # complete
-        await frm.make_active(ctx.bot.game)
-        await safe_send(frm.member, "Message sent!")
-        return
+        # inform sts and observers in the background
+        if not to_storytellers:
+            for st in ctx.bot.game.storytellers:
+                ctx.bot.outbox.notify(st.member, report)
+        for observer in ctx.bot.observers:
+            ctx.bot.outbox.notify(observer, report)
+
+        # acknowledge the sender, alongside the public report
+        sends = [(frm.member, "Message sent!")]
+        if ctx.bot.instant_message_reporting:
+            sends.append((ctx.bot.channel, f"**{frm.nick}** > **{self.nick}**"))
+        await safe_send_all(ctx.bot, sends)
 
     def revive(self, game: "Game") -> str:
         """Handle effect cleanup when the player revives.
@@ -408,6 +456,8 @@ class Player:
             if effect.status(game, "dead") or effect.status(game, "used_ability"):
                 # TODO: figure out how this should work with registers_status
                 self.effects.remove(effect)
+                game.unregister_effect(effect)
+        game.invalidate_statuses()
 
         for effect in self.source_effects(game):
             effect.source_starts_functioning(game)
@@ -423,7 +473,9 @@ class Player:
             if effect not in (Good, Evil):
                 effect.delete(ctx.bot.game)
 
+        ctx.bot.game.unregister_character(self.character)
         self.character = new_character(self)
+        ctx.bot.game.register_character(self.character)
         for effect_type in self.character.default_effects:
             if effect_type not in (Good, Evil):
                 self.add_effect(ctx.bot.game, effect_type, self)
@@ -452,6 +504,7 @@ class Player:
         def effect_adder():
             """Add the effect to the player's effects list."""
             self.effects.append(effect_object)
+            game.register_effect(effect_object)
 
         return effect_object.turn_on(game, effect_adder)
 
@@ -459,17 +512,17 @@ class Player:
         """Execute the player."""
         message_text = f"{self.nick} has been executed, "
         if self.ghost(ctx.bot.game):
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel, message_text + "but is already dead.",
             )
 
         elif self.is_status(ctx.bot.game, "safe"):
-            await safe_send(
+            await ctx.bot.outbox.announce(
                 ctx.bot.channel, message_text + "but does not die.",
             )
 
         else:
-            await safe_send(ctx.bot.channel, message_text + "and dies.")
+            await ctx.bot.outbox.announce(ctx.bot.channel, message_text + "and dies.")
             self.add_effect(ctx.bot.game, Dead, self)
 
         # Day.end has a "successfully ended the day" message so this is above that
@@ -480,7 +533,7 @@ class Player:
             # TODO: currently doesn't support extra-nomination effects
             await ctx.bot.game.current_day.end(ctx)
 
-    async def make_active(self, game: "Game"):
+    async def make_active(self, bot: "BOTCBot"):
         """Set has_spoken to true and update storytellers."""
 
         def _updater_func(inner_game: "Game") -> typing.List["Player"]:
@@ -489,7 +542,7 @@ class Player:
             self.has_spoken = True
             return inner_game.not_active
 
-        await _update_activity(game, _updater_func, "spoken", "speak")
+        _update_activity(bot, _updater_func, "spoken", "speak")
 
     async def add_nomination(self, ctx: "DayContext", skip: bool = False):
         """Set has_spoken to true and update storytellers."""
@@ -504,8 +557,8 @@ class Player:
                 self.nominations_today += 1
             return game.to_nominate
 
-        await _update_activity(
-            ctx.bot.game, _updater_func, "nominated or skipped", "nominate or skip"
+        _update_activity(
+            ctx.bot, _updater_func, "nominated or skipped", "nominate or skip"
         )
 
     # Helpful properties
@@ -544,19 +597,71 @@ class Player:
     @property
     def id(self) -> int:
         """Determine the player's discord id."""
-        return self.member.id
+        # the member is still an id while a game is being restored
+        return getattr(self.member, "id", self.member)
 
     def __repr__(self):
         """Add easier formatting for repl introspection and debugging."""
         return self.epithet
 
-    # Dill Stuff
-    def __getstate__(self) -> dict:
-        """Cleanup when pickled."""
-        state = self.__dict__.copy()
-        state["member"] = self.member.id  # discord snowflake objects are not picklable
+    # State Stuff
+    _STATE_ATTRIBUTES = (
+        "position",
+        "dead_votes",
+        "has_spoken",
+        "nominations_today",
+        "has_been_nominated",
+        "has_skipped",
+        "is_inactive",
+    )
+
+    def to_state(self, writer: "StateWriter") -> typing.Dict[str, typing.Any]:
+        """Convert the player to plain data, excluding their message history.
+
+        Message histories are interned by Game.to_state, since each message is shared
+        between two players.
+        """
+        state = {
+            attribute: getattr(self, attribute) for attribute in self._STATE_ATTRIBUTES
+        }
+        state["member"] = self.id
+        state["character"] = class_name(type(self.character))
+        # copied, so that the state doesn't change along with the character
+        state["character_attributes"] = deepcopy(
+            {
+                attribute: value
+                for attribute, value in self.character.__dict__.items()
+                if attribute not in ("parent", "default_effects")
+            }
+        )
+        state["effects"] = [effect.to_state(writer) for effect in self.effects]
         return state
 
+    @classmethod
+    def from_state(cls, state: typing.Dict[str, typing.Any]) -> "Player":
+        """Create a player from plain data generated by to_state.
+
+        The player's member is left as an id, and their effects and message history are
+        filled in by StateReader once every player exists.
+        """
+        player = cls.__new__(cls)
+        for attribute in cls._STATE_ATTRIBUTES:
+            setattr(player, attribute, state[attribute])
+        player.member = state["member"]
+        player.character = resolve_class(state["character"])(player)
+        player.character.__dict__.update(state["character_attributes"])
+        player.effects = []
+        player.message_history = []
+        return player
+
+    def effects_from_state(
+        self, state: typing.Dict[str, typing.Any], reader: "StateReader"
+    ):
+        """Restore the player's effects from plain data generated by to_state."""
+        self.effects = [
+            Effect.from_state(effect, self, reader) for effect in state["effects"]
+        ]
+
     def __hash__(self):
         """Hashes the object."""
         try:
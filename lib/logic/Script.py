@@ -1,13 +1,18 @@
 """Contains the Script class and script_list generator."""
 
-from os import listdir
-from typing import TYPE_CHECKING, Generator, List, Tuple, Type
+from os import listdir, stat
+from time import monotonic
+from types import MappingProxyType
+from typing import (TYPE_CHECKING, Any, Dict, FrozenSet, Generator, List,
+                    Mapping, NamedTuple, Optional, Sequence, Tuple, Type,
+                    Union)
 
-from dill import dump, load
+from dill import loads
 
 from lib.logic.Character import Character, Demon, Minion, Outsider, Townsfolk
+from lib.state import class_name, dumps, is_state, loads as loads_state, resolve_class
 from lib.utils import list_to_plural_string
-from resources.basegame import characters
+from resources.basegame.characters import load_character
 
 try:
     from resources.playtest import playtestcharacters
@@ -18,6 +23,121 @@ except ImportError:
 if TYPE_CHECKING:
     from lib.typings.context import Context
 
+# The directories custom scripts are saved in, by whether they are playtest scripts.
+_SCRIPT_DIRECTORIES = {
+    False: "resources/basegame/scripts/",
+    True: "resources/playtest/scripts/",
+}
+
+# How long, in seconds, loaded scripts are trusted before checking whether their
+# directory has changed.
+_REVALIDATE_AFTER = 5.0
+
+# the default scripts built so far, by name
+_builtin_scripts: Dict[str, "Script"] = {}
+
+# directory -> (its mtime when loaded, or None if it doesn't exist, and its scripts)
+_loaded: Dict[str, Tuple[Optional[int], List["Script"]]] = {}
+
+# directory -> when its mtime was last checked
+_validated: Dict[str, float] = {}
+
+# playtest -> (the script lists indexed, the index from search keys to scripts)
+_indices: Dict[
+    bool, Tuple[List[Sequence["_ScriptSource"]], Dict[str, "_ScriptSource"]]
+] = {}
+
+# The character types a script's characters are partitioned into, in display order.
+_CHARACTER_TYPES = (Townsfolk, Outsider, Minion, Demon)
+
+# The Script attributes a CompiledScript is derived from.
+_COMPILED_FROM = frozenset({"name", "character_list", "first_night", "other_nights"})
+
+
+def _atheist() -> Optional[Type[Character]]:
+    """Find the Atheist, or None if playtest characters aren't available."""
+    try:
+        return playtestcharacters.Atheist.Atheist
+    except (NameError, AttributeError):
+        return None
+
+
+def _ranks(night_order: List[Type[Character]]) -> Mapping[Type[Character], int]:
+    """Rank characters by their first position in a night order."""
+    out = {}  # type: Dict[Type[Character], int]
+    for rank, character in enumerate(night_order):
+        out.setdefault(character, rank)
+    return MappingProxyType(out)
+
+
+class CompiledScript(NamedTuple):
+    """An immutable form of a script, which answers queries about it quickly.
+
+    Attributes
+    ----------
+    characters : FrozenSet[Type[Character]]
+        The characters on the script.
+    by_name : Mapping[str, Type[Character]]
+        The characters on the script, by class name.
+    by_type : Mapping[Type[Character], Tuple[Type[Character], ...]]
+        The characters on the script of each character type, for instance Townsfolk.
+    first_night_ranks : Mapping[Type[Character], int]
+        The position of each character in the first night order.
+    other_night_ranks : Mapping[Type[Character], int]
+        The position of each character in the order for other nights.
+    has_atheist : bool
+        Whether the Atheist is on the script.
+
+    Notes
+    -----
+    Rules text isn't compiled, since it is reread when character_info.json changes.
+    """
+
+    characters: FrozenSet[Type[Character]]
+    by_name: Mapping[str, Type[Character]]
+    by_type: Mapping[Type[Character], Tuple[Type[Character], ...]]
+    first_night_ranks: Mapping[Type[Character], int]
+    other_night_ranks: Mapping[Type[Character], int]
+    has_atheist: bool
+
+    @classmethod
+    def compile(cls, script: "Script") -> "CompiledScript":
+        """Compile a script."""
+        by_type = MappingProxyType(
+            {
+                character_type: tuple(
+                    x for x in script.character_list if issubclass(x, character_type)
+                )
+                for character_type in _CHARACTER_TYPES
+            }
+        )
+
+        characters = frozenset(script.character_list)
+        return cls(
+            characters=characters,
+            by_name=MappingProxyType(
+                {x.__name__: x for x in reversed(script.character_list)}
+            ),
+            by_type=by_type,
+            first_night_ranks=_ranks(script.first_night),
+            other_night_ranks=_ranks(script.other_nights),
+            has_atheist=_atheist() in characters,
+        )
+
+
+def _character_type_info(
+    cls: Type[Character],
+    by_type: Mapping[Type[Character], Tuple[Type[Character], ...]],
+) -> str:
+    """Generate a list of characters of cls type."""
+    s = "" if cls == Townsfolk else "s"
+    out = f"\n\n__{cls.__name__}{s}:__"
+    for character in by_type[cls]:
+        out += "\n> **{char_name}** - {char_rules}".format(
+            char_name=character.name, char_rules=character.rules_text(),
+        )
+    return out
+
 
 class Script:
     """Stores information about a specific script.
@@ -71,59 +191,102 @@ class Script:
         self.first_night = first_night or []
         self.other_nights = other_nights or []
 
-    def has_character(self, character: Character) -> bool:
+    def __setattr__(self, name: str, value: Any):
+        """Set an attribute, discarding the compiled script if it depended on it."""
+        super().__setattr__(name, value)
+        if name in _COMPILED_FROM:
+            self.__dict__.pop("_compiled", None)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the script without its compiled form, which is rebuilt on demand."""
+        state = self.__dict__.copy()
+        state.pop("_compiled", None)
+        return state
+
+    @property
+    def compiled(self) -> CompiledScript:
+        """Determine the script's compiled form, compiling it on first use.
+
+        It is recompiled after name, character_list, first_night or other_nights is
+        reassigned. Those lists must not be modified in place.
+        """
+        try:
+            return self.__dict__["_compiled"]
+        except KeyError:
+            out = self.__dict__["_compiled"] = CompiledScript.compile(self)
+            return out
+
+    def find_character(self, name: str) -> Optional[Type[Character]]:
+        """Find the character on the script with a class name, or None."""
+        return self.compiled.by_name.get(name)
+
+    def has_character(self, character: Type[Character]) -> bool:
         """Whether character is on the script."""
-        return character in self.character_list
+        return character in self.compiled.characters
 
     @property
     def has_atheist(self) -> bool:
         """Whether the atheist is on the script."""
-        try:
-            return self.has_character(playtestcharacters.Atheist.Atheist)
-        except NameError:
-            return False
+        return self.compiled.has_atheist
 
     def save(self):
         """Save the script."""
-        if self.playtest:
-            with open(
-                "resources/playtest/scripts/" + self.name + ".pckl", "wb"
-            ) as file:
-                dump(self, file)
-        else:
-            with open(
-                "resources/basegame/scripts/" + self.name + ".pckl", "wb"
-            ) as file:
-                dump(self, file)
+        directory = _SCRIPT_DIRECTORIES[self.playtest]
+        with open(directory + self.name + ".pckl", "wb") as file:
+            file.write(dumps(self.to_state()))
+
+        # overwriting a file doesn't change its directory's mtime
+        _loaded.pop(directory, None)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Convert the script to plain data, referencing characters by name."""
+        return {
+            "name": self.name,
+            "character_list": [class_name(x) for x in self.character_list],
+            "aliases": list(self.aliases),
+            "first_night": [class_name(x) for x in self.first_night],
+            "other_nights": [class_name(x) for x in self.other_nights],
+            "editors": list(self.editors),
+            "playtest": self.playtest,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Script":
+        """Create a script from plain data generated by to_state."""
+        return cls(
+            state["name"],
+            [resolve_class(x) for x in state["character_list"]],
+            aliases=state["aliases"],
+            first_night=[resolve_class(x) for x in state["first_night"]],
+            other_nights=[resolve_class(x) for x in state["other_nights"]],
+            editors=state["editors"],
+            playtest=state["playtest"],
+        )
 
     # noinspection PyTypeChecker
     # this is bugged with the combination of property and classmethod decorators
     # that we use to define the NightOrderMember abc
     def info(self, ctx: "Context") -> Generator[str, None, None]:
-        """Return a generator with information about the script."""
-        # TODO: more specific message length handling here than in safe_send
+        """Return a generator with information about the script.
 
+        Each section is yielded separately, and safe_send splits long sections between
+        characters' lines. Rules text comes from the cached character metadata, so it
+        reflects the current character_info.json.
+        """
+        by_type = self.compiled.by_type
         with ctx.typing():
-            message_text = f"**__{self.name}:__**"
-            message_text += self._character_type_info(Townsfolk)
-            yield message_text  # we want to separate townsfolk from other characters
-
-            message_text = ""
-            for cls in (Outsider, Minion, Demon):
-                message_text += self._character_type_info(cls)
-            yield message_text
-
-            message_text = "__First Night:__\nDusk\nMinion Info\nDemon Info"
-            for character in self.first_night:
-                message_text += "\n" + character.name
-            message_text += "\nDawn"
-
-            message_text += "\n\n__Other Nights:__\nDusk"
-            for character in self.other_nights:
-                message_text += "\n" + character.name
-            message_text += "\nDawn"
-
-            yield message_text
+            # townsfolk are separated from other characters
+            yield f"**__{self.name}:__**" + _character_type_info(Townsfolk, by_type)
+            yield "".join(
+                _character_type_info(x, by_type) for x in _CHARACTER_TYPES[1:]
+            )
+            yield (
+                "__First Night:__\nDusk\nMinion Info\nDemon Info"
+                + "".join("\n" + x.name for x in self.first_night)
+                + "\nDawn\n\n__Other Nights:__\nDusk"
+                + "".join("\n" + x.name for x in self.other_nights)
+                + "\nDawn"
+            )
 
     def editor_names(self, ctx: "Context") -> Tuple[str, bool]:
         """Determine the names of the bot's editors."""
@@ -140,23 +303,16 @@ class Script:
         editors = (self.editor_names(ctx))[0]
         return f"**{self.name}:**\n> Aliases: {aliases}\n> Editors: {editors}"
 
-    def _character_type_info(self, cls: Type["Character"]) -> str:
-        """Generate a list of characters of cls type."""
-        s = "" if cls == Townsfolk else "s"
-        out = f"\n\n__{cls.__name__}{s}:__"
-        for character in self.character_list:
-            if issubclass(character, cls):
-                out += "\n> **{char_name}** - {char_rules}".format(
-                    char_name=character.name, char_rules=character.rules_text(),
-                )
-        return out
-
 
 def script_list(
     ctx: "Context", playtest: bool = False
 ) -> Generator[Script, None, None]:
     """Find all scripts.
 
+    Scripts are loaded once and kept in memory. Saved scripts are reloaded when their
+    directory changes, which is checked at most every few seconds, or when a script is
+    saved.
+
     Parameters
     ----------
     ctx : Context
@@ -169,200 +325,333 @@ def script_list(
     Script
         Default scripts, or scripts stored in resources.
     """
-    # Add the three default scripts
-    # not sure this will work so it needs testing
-    yield Script(
+    for scripts in _script_sources(playtest):
+        for script in scripts:
+            yield _build(script)
+
+
+def find_script(argument: str, playtest: bool = False) -> Optional[Script]:
+    """Find the first script whose name contains argument, or with argument as an alias.
+
+    The match ignores case. Every substring of every script's name and every alias is
+    indexed, so a lookup is a single dictionary access; the index is rebuilt only when
+    the scripts are reloaded.
+
+    Parameters
+    ----------
+    argument : str
+        The text to match.
+    playtest : bool
+        Whether to search playtest scripts.
+
+    Returns
+    -------
+    Optional[Script]
+        The first matching script in the order of script_list, or None. Default scripts
+        are only built, importing their characters, once they match.
+    """
+    sources = _script_sources(playtest)
+    indexed = _indices.get(playtest)
+    if (
+        indexed is None
+        or len(indexed[0]) != len(sources)
+        or any(old is not new for old, new in zip(indexed[0], sources))
+    ):
+        index = {}  # type: Dict[str, _ScriptSource]
+        for scripts in sources:
+            for script in scripts:
+                name = script.name.lower()
+                for start in range(len(name) + 1):
+                    for end in range(start, len(name) + 1):
+                        index.setdefault(name[start:end], script)
+                for alias in script.aliases:
+                    index.setdefault(alias.lower(), script)
+        indexed = _indices[playtest] = (sources, index)
+
+    script = indexed[1].get(argument.lower())
+    return None if script is None else _build(script)
+
+
+def find_script_named(name: str, playtest: bool = False) -> Optional[Script]:
+    """Find the first script named name, ignoring case.
+
+    Unlike find_script, this matches whole names only, and builds only the match.
+
+    Parameters
+    ----------
+    name : str
+        The name to match.
+    playtest : bool
+        Whether to search playtest scripts.
+
+    Returns
+    -------
+    Optional[Script]
+        The first script named name in the order of script_list, or None.
+    """
+    name = name.lower()
+    for scripts in _script_sources(playtest):
+        for script in scripts:
+            if script.name.lower() == name:
+                return _build(script)
+    return None
+
+
+def _build(script: "_ScriptSource") -> Script:
+    """Build a default script, or return a saved script as is."""
+    if isinstance(script, Script):
+        return script
+    return script.script()
+
+
+def _script_sources(playtest: bool) -> List[Sequence["_ScriptSource"]]:
+    """Determine the lists of scripts to search, loading any which changed."""
+    # get custom scripts from resources
+    out = [_BUILTIN_SCRIPTS, _directory_scripts(_SCRIPT_DIRECTORIES[False])]
+    if playtest:
+        out.append(_directory_scripts(_SCRIPT_DIRECTORIES[True]))
+    return out
+
+
+class _BuiltinScript(NamedTuple):
+    """A default script, whose characters are named rather than imported.
+
+    The characters are imported only when the script is built, the first time it is
+    needed, so characters on scripts not in play are never loaded.
+    """
+
+    name: str
+    character_list: List[str]
+    first_night: List[str]
+    other_nights: List[str]
+    aliases: List[str]
+
+    def script(self) -> Script:
+        """Build the script, or find it if it was already built."""
+        try:
+            return _builtin_scripts[self.name]
+        except KeyError:
+            out = _builtin_scripts[self.name] = Script(
+                self.name,
+                [load_character(x) for x in self.character_list],
+                first_night=[load_character(x) for x in self.first_night],
+                other_nights=[load_character(x) for x in self.other_nights],
+                aliases=list(self.aliases),
+                editors=[],
+            )
+            return out
+
+
+# A saved script, or a default script which may not have been built yet.
+_ScriptSource = Union[Script, _BuiltinScript]
+
+# The three default scripts.
+_BUILTIN_SCRIPTS = (
+    _BuiltinScript(
         "Trouble Brewing",
-        [
-            characters.Investigator,
-            characters.Chef,
-            characters.Washerwoman,
-            characters.Librarian,
-            characters.Empath,
-            characters.FortuneTeller,
-            characters.Undertaker,
-            characters.Monk,
-            characters.Slayer,
-            characters.Soldier,
-            characters.Ravenkeeper,
-            characters.Virgin,
-            characters.Mayor,
-            characters.Butler,
-            characters.Saint,
-            characters.Recluse,
-            characters.Drunk,
-            characters.Poisoner,
-            characters.Spy,
-            characters.Baron,
-            characters.ScarletWoman,
-            characters.Imp,
+        character_list=[
+            "Investigator",
+            "Chef",
+            "Washerwoman",
+            "Librarian",
+            "Empath",
+            "FortuneTeller",
+            "Undertaker",
+            "Monk",
+            "Slayer",
+            "Soldier",
+            "Ravenkeeper",
+            "Virgin",
+            "Mayor",
+            "Butler",
+            "Saint",
+            "Recluse",
+            "Drunk",
+            "Poisoner",
+            "Spy",
+            "Baron",
+            "ScarletWoman",
+            "Imp",
         ],
         first_night=[
-            characters.Poisoner,
-            characters.Washerwoman,
-            characters.Librarian,
-            characters.Chef,
-            characters.Investigator,
-            characters.Empath,
-            characters.FortuneTeller,
-            characters.Butler,
-            characters.Spy,
+            "Poisoner",
+            "Washerwoman",
+            "Librarian",
+            "Chef",
+            "Investigator",
+            "Empath",
+            "FortuneTeller",
+            "Butler",
+            "Spy",
         ],
         other_nights=[
-            characters.Poisoner,
-            characters.Monk,
-            characters.ScarletWoman,
-            characters.Imp,
-            characters.Ravenkeeper,
-            characters.Empath,
-            characters.FortuneTeller,
-            characters.Butler,
-            characters.Undertaker,
-            characters.Spy,
+            "Poisoner",
+            "Monk",
+            "ScarletWoman",
+            "Imp",
+            "Ravenkeeper",
+            "Empath",
+            "FortuneTeller",
+            "Butler",
+            "Undertaker",
+            "Spy",
         ],
         aliases=["TB"],
-        editors=[],
-    )
-    # noinspection DuplicatedCode
-    yield Script(
+    ),
+    _BuiltinScript(
         "Bad Moon Rising",
-        [
-            characters.Grandmother,
-            characters.Sailor,
-            characters.Chambermaid,
-            characters.Innkeeper,
-            characters.Gambler,
-            characters.Exorcist,
-            characters.Gossip,
-            characters.Courtier,
-            characters.Professor,
-            characters.Fool,
-            characters.Pacifist,
-            characters.TeaLady,
-            characters.Minstrel,
-            characters.Tinker,
-            characters.Moonchild,
-            characters.Goon,
-            characters.Lunatic,
-            characters.Godfather,
-            characters.DevilSAdvocate,
-            characters.Assassin,
-            characters.Mastermind,
-            characters.Pukka,
-            characters.Shabaloth,
-            characters.Po,
-            characters.Zombuul,
+        character_list=[
+            "Grandmother",
+            "Sailor",
+            "Chambermaid",
+            "Innkeeper",
+            "Gambler",
+            "Exorcist",
+            "Gossip",
+            "Courtier",
+            "Professor",
+            "Fool",
+            "Pacifist",
+            "TeaLady",
+            "Minstrel",
+            "Tinker",
+            "Moonchild",
+            "Goon",
+            "Lunatic",
+            "Godfather",
+            "DevilSAdvocate",
+            "Assassin",
+            "Mastermind",
+            "Pukka",
+            "Shabaloth",
+            "Po",
+            "Zombuul",
         ],
         first_night=[
-            characters.Lunatic,
-            characters.Sailor,
-            characters.Courtier,
-            characters.Godfather,
-            characters.DevilSAdvocate,
-            characters.Pukka,
-            characters.Grandmother,
-            characters.Chambermaid,
-            characters.Goon,
+            "Lunatic",
+            "Sailor",
+            "Courtier",
+            "Godfather",
+            "DevilSAdvocate",
+            "Pukka",
+            "Grandmother",
+            "Chambermaid",
+            "Goon",
         ],
         other_nights=[
-            characters.Sailor,
-            characters.Innkeeper,
-            characters.Courtier,
-            characters.DevilSAdvocate,
-            characters.Gambler,
-            characters.Exorcist,
-            characters.Lunatic,
-            characters.Zombuul,
-            characters.Pukka,
-            characters.Shabaloth,
-            characters.Po,
-            characters.Assassin,
-            characters.Gossip,
-            characters.Tinker,
-            characters.Moonchild,
-            characters.Godfather,
-            characters.Professor,
-            characters.Chambermaid,
-            characters.Goon,
+            "Sailor",
+            "Innkeeper",
+            "Courtier",
+            "DevilSAdvocate",
+            "Gambler",
+            "Exorcist",
+            "Lunatic",
+            "Zombuul",
+            "Pukka",
+            "Shabaloth",
+            "Po",
+            "Assassin",
+            "Gossip",
+            "Tinker",
+            "Moonchild",
+            "Godfather",
+            "Professor",
+            "Chambermaid",
+            "Goon",
         ],
         aliases=["BMR"],
-        editors=[],
-    )
-    # noinspection DuplicatedCode
-    yield Script(
+    ),
+    _BuiltinScript(
         "Sects & Violets",
-        [
-            characters.Clockmaker,
-            characters.Dreamer,
-            characters.SnakeCharmer,
-            characters.Mathematician,
-            characters.Flowergirl,
-            characters.TownCrier,
-            characters.Oracle,
-            characters.Savant,
-            characters.Artist,
-            characters.Seamstress,
-            characters.Philosopher,
-            characters.Juggler,
-            characters.Sage,
-            characters.Sweetheart,
-            characters.Mutant,
-            characters.Barber,
-            characters.Klutz,
-            characters.EvilTwin,
-            characters.Witch,
-            characters.Cerenovus,
-            characters.PitHag,
-            characters.NoDashii,
-            characters.Vigormortis,
-            characters.FangGu,
-            characters.Vortox,
+        character_list=[
+            "Clockmaker",
+            "Dreamer",
+            "SnakeCharmer",
+            "Mathematician",
+            "Flowergirl",
+            "TownCrier",
+            "Oracle",
+            "Savant",
+            "Artist",
+            "Seamstress",
+            "Philosopher",
+            "Juggler",
+            "Sage",
+            "Sweetheart",
+            "Mutant",
+            "Barber",
+            "Klutz",
+            "EvilTwin",
+            "Witch",
+            "Cerenovus",
+            "PitHag",
+            "NoDashii",
+            "Vigormortis",
+            "FangGu",
+            "Vortox",
         ],
         first_night=[
-            characters.Philosopher,
-            characters.SnakeCharmer,
-            characters.EvilTwin,
-            characters.Witch,
-            characters.Cerenovus,
-            characters.Clockmaker,
-            characters.Dreamer,
-            characters.Seamstress,
-            characters.Mathematician,
+            "Philosopher",
+            "SnakeCharmer",
+            "EvilTwin",
+            "Witch",
+            "Cerenovus",
+            "Clockmaker",
+            "Dreamer",
+            "Seamstress",
+            "Mathematician",
         ],
         other_nights=[
-            characters.Philosopher,
-            characters.SnakeCharmer,
-            characters.Witch,
-            characters.Cerenovus,
-            characters.PitHag,
-            characters.FangGu,
-            characters.NoDashii,
-            characters.Vortox,
-            characters.Vigormortis,
-            characters.Barber,
-            characters.Sage,
-            characters.Dreamer,
-            characters.Seamstress,
-            characters.Flowergirl,
-            characters.TownCrier,
-            characters.Oracle,
-            characters.Juggler,
-            characters.Mathematician,
+            "Philosopher",
+            "SnakeCharmer",
+            "Witch",
+            "Cerenovus",
+            "PitHag",
+            "FangGu",
+            "NoDashii",
+            "Vortox",
+            "Vigormortis",
+            "Barber",
+            "Sage",
+            "Dreamer",
+            "Seamstress",
+            "Flowergirl",
+            "TownCrier",
+            "Oracle",
+            "Juggler",
+            "Mathematician",
         ],
         aliases=["Sects and Violets", "SV", "S&V", "SnV"],
-        editors=[],
-    )
+    ),
+)
 
-    # get custom scripts from resources
-    for filename in listdir("resources/basegame/scripts/"):
-        if filename.endswith(".pckl"):
-            with open("resources/basegame/scripts/" + filename, "rb") as file:
-                script: Script = load(file)
-                yield script
 
-    if playtest:
-        for filename in listdir("resources/playtest/scripts/"):
-            if filename.endswith(".pckl"):
-                with open("resources/playtest/scripts/" + filename, "rb") as file:
-                    playtest_script: Script = load(file)
-                    yield playtest_script
+def _directory_scripts(directory: str) -> List[Script]:
+    """Determine the scripts saved in a directory, reloading them if it changed."""
+    if directory in _loaded and monotonic() - _validated[directory] < _REVALIDATE_AFTER:
+        return _loaded[directory][1]
+    _validated[directory] = monotonic()
+
+    try:
+        mtime = stat(directory).st_mtime_ns  # type: Optional[int]
+    except FileNotFoundError:
+        mtime = None
+
+    if directory not in _loaded or _loaded[directory][0] != mtime:
+        scripts = []  # type: List[Script]
+        if mtime is not None:
+            for filename in sorted(listdir(directory)):
+                if filename.endswith(".pckl"):
+                    scripts.append(_load_script(directory + filename))
+        _loaded[directory] = (mtime, scripts)
+
+    return _loaded[directory][1]
+
+
+def _load_script(file_name: str) -> Script:
+    """Load a saved script, whether it is a state or a legacy pickle."""
+    with open(file_name, "rb") as file:
+        data = file.read()
+    if is_state(data):
+        return Script.from_state(loads_state(data))
+    return loads(data)
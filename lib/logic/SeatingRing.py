@@ -0,0 +1,127 @@
+"""Contains the SeatingRing class."""
+
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from lib.logic.Game import Game
+    from lib.logic.Player import Player
+
+
+class SeatingRing:
+    """Stores the seating order as a ring, with O(1) position and neighbor lookups.
+
+    Every player's position attribute is kept up to date as players are seated and
+    removed.
+
+    Parameters
+    ----------
+    players : List[Player]
+        The players, in order.
+
+    Attributes
+    ----------
+    players : List[Player]
+        The players, in order. Modify it only with insert and remove.
+    """
+
+    def __init__(self, players: List["Player"]):
+        self.players = players
+        self._positions = {}  # type: Dict[int, int]
+        self._reindex()
+
+    def _reindex(self, start: int = 0):
+        """Update the positions of every player from start onwards."""
+        for position in range(start, len(self.players)):
+            player = self.players[position]
+            player.position = position
+            self._positions[player.id] = position
+
+    def __len__(self) -> int:
+        """Determine the number of players."""
+        return len(self.players)
+
+    def __iter__(self) -> Iterator["Player"]:
+        """Iterate over the players, in order."""
+        return iter(self.players)
+
+    def __contains__(self, player: "Player") -> bool:
+        """Determine whether a player is seated."""
+        return player.id in self._positions
+
+    def position(self, player: "Player") -> int:
+        """Determine a player's position in the seating order.
+
+        Raises
+        ------
+        KeyError
+            If the player is not seated.
+        """
+        return self._positions[player.id]
+
+    def insert(self, position: int, player: "Player"):
+        """Seat a player at a position, moving everyone after them down one seat."""
+        self.players.insert(position, player)
+        self._reindex(position)
+
+    def remove(self, player: "Player"):
+        """Remove a player, moving everyone after them up one seat."""
+        position = self._positions.pop(player.id)
+        del self.players[position]
+        self._reindex(position)
+
+    def next(self, player: "Player") -> "Player":
+        """Determine the player seated after player (their downwards neighbor)."""
+        return self.players[(self._positions[player.id] + 1) % len(self.players)]
+
+    def previous(self, player: "Player") -> "Player":
+        """Determine the player seated before player (their upwards neighbor)."""
+        return self.players[self._positions[player.id] - 1]
+
+    def walk(self, player: "Player", upwards: bool = False) -> Iterator["Player"]:
+        """Iterate around the ring from player's neighbor, excluding player.
+
+        Parameters
+        ----------
+        player : Player
+            The player to start from.
+        upwards : bool
+            Whether to walk upwards, towards previous players, rather than downwards.
+        """
+        position = self._positions[player.id]
+        step = -1 if upwards else 1
+        for offset in range(1, len(self.players)):
+            yield self.players[(position + step * offset) % len(self.players)]
+
+    def after(self, player: "Player") -> List["Player"]:
+        """Determine the seating order starting after player and ending with them."""
+        position = self._positions[player.id] + 1
+        return self.players[position:] + self.players[:position]
+
+    def neighbors(
+        self,
+        player: "Player",
+        game: "Game",
+        condition: Callable[["Player", "Game"], bool] = lambda x, y: True,
+    ) -> Tuple[Optional["Player"], Optional["Player"]]:
+        """Determine a player's nearest neighbors satisfying a condition.
+
+        Parameters
+        ----------
+        player : Player
+            The player whose neighbors to find.
+        game : Game
+            The current game.
+        condition : Callable[[Player, Game], bool]
+            Conditions to be satisfied by the neighbors.
+
+        Returns
+        -------
+        Tuple[Optional[Player], Optional[Player]]
+            The upwards neighbor and the downwards neighbor satisfying condition, or
+            None if nobody else does.
+        """
+        upwards = next(
+            (x for x in self.walk(player, upwards=True) if condition(x, game)), None
+        )
+        downwards = next((x for x in self.walk(player) if condition(x, game)), None)
+        return upwards, downwards
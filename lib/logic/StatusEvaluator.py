@@ -0,0 +1,58 @@
+"""Contains the StatusEvaluator class."""
+
+from typing import Callable, Dict, Hashable, List, Tuple
+
+
+class StatusEvaluator:
+    """Evaluates statuses depth-first, detecting cycles between them.
+
+    A status can depend on other players' statuses, for instance the Vigormortis's
+    kill depends on whether the Vigormortis is functioning, and those dependencies can
+    loop back on themselves (say, if the Vigormortis kills a Poisoner who poisons the
+    Vigormortis). The evaluator tracks which statuses are currently being evaluated,
+    so a loop is detected the moment it closes rather than when the stack overflows.
+
+    Cycles are resolved to the least fixed point: a status which is reached again
+    while it is still being evaluated is assumed not to apply. Results which relied on
+    that assumption are provisional and must not be memoized, except for the status
+    at the root of the cycle, whose result is final once the cycle is unwound.
+    """
+
+    def __init__(self):
+        self._depths = {}  # type: Dict[Hashable, int]
+        self._lows = []  # type: List[int]
+
+    def evaluate(self, key: Hashable, func: Callable[[], bool]) -> Tuple[bool, bool]:
+        """Evaluate a status, unless it is already being evaluated.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies the status, for instance (player id, status, registers).
+        func : Callable[[], bool]
+            Determines whether the status applies.
+
+        Returns
+        -------
+        bool
+            Whether the status applies.
+        bool
+            Whether the result is final, and so may be memoized.
+        """
+        if key in self._depths:
+            # a cycle: everything above this status on the stack is provisional
+            self._lows[-1] = min(self._lows[-1], self._depths[key])
+            return False, False
+
+        depth = len(self._lows)
+        self._depths[key] = depth
+        self._lows.append(depth)
+        try:
+            value = func()
+        finally:
+            del self._depths[key]
+            low = self._lows.pop()
+
+        if self._lows:
+            self._lows[-1] = min(self._lows[-1], low)
+        return value, low >= depth
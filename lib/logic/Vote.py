@@ -1,14 +1,14 @@
 """Contains the Vote class."""
 
-from typing import TYPE_CHECKING, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from lib.preferences import load_preferences
 from lib.utils import get_bool_input, list_to_plural_string, safe_send
 
 if TYPE_CHECKING:
-    from discord import Message
     from lib.logic.Player import Player
     from lib.logic.Game import Game
+    from lib.state import StateReader, StateWriter
     from lib.typings.context import VoteContext
 
 
@@ -69,14 +69,9 @@ class Vote:
 
         # determine the _order
         if self.storyteller:
-            self.order = game.seating_order
+            self.order = list(game.seating_order)
         else:
-            self.order = (
-                # flake8: noqa
-                # this is a false positive; the space is black-enforced
-                game.seating_order[game.seating_order.index(self.nominee) + 1 :]
-                + game.seating_order[: game.seating_order.index(self.nominee) + 1]
-            )
+            self.order = game.seating.after(self.nominee)
 
         # determine the majority
         if self.traveler:
@@ -144,7 +139,7 @@ class Vote:
             self.voted.append(voter)
 
         # announcement
-        msg = await safe_send(
+        msg = await ctx.bot.outbox.announce(
             ctx.bot.channel,
             "{voter} votes {vote}. {votes} votes.".format(
                 voter=voter.nick, vote=["no", "yes"][vt], votes=self.votes
@@ -173,7 +168,7 @@ class Vote:
             return await self.vote(ctx, self.to_vote, self.prevotes[self.to_vote])
 
         # announcement
-        await safe_send(
+        await ctx.bot.outbox.announce(
             ctx.bot.channel,
             f"{self.to_vote.member.mention}, your vote on {self.nominee.nick}.",
         )
@@ -236,19 +231,19 @@ class Vote:
                     )
 
             # cleanup pins
-            for msg in self.announcements:
-                msg_actual: Message = await ctx.bot.channel.fetch_message(msg)
-                if msg_actual.pinned:
-                    await msg_actual.unpin()
+            await ctx.bot.game.pins.unpin(ctx.bot.channel, self.announcements)
 
     async def _update_old_vote_end_message(self, ctx: "VoteContext", result: bool):
         """Update the old vote end message as appropriate."""
         if ctx.bot.game.current_day.about_to_die:
             if result or self.votes == ctx.bot.game.current_day.about_to_die[1]:
-                msg = await ctx.bot.channel.fetch_message(
-                    ctx.bot.game.current_day.about_to_die[2]
+                idn = ctx.bot.game.current_day.about_to_die[2]
+                content = (
+                    await ctx.bot.game.message_cache.get(ctx.bot.channel, idn)
+                ).content
+                await ctx.bot.game.message_cache.edit(
+                    ctx.bot.channel, idn, content[:-22] + " not" + content[-22:]
                 )
-                await msg.edit(content=msg.content[:-22] + " not" + msg.content[-22:])
 
                 # remove about_to_die
                 if not result:
@@ -257,7 +252,7 @@ class Vote:
     async def _send_vote_end_message(self, ctx: "VoteContext"):
         """Send a message ending the vote."""
         message_text, result = self._generate_vote_end_message()
-        end_msg = await safe_send(ctx.bot.channel, message_text, pin=True)
+        end_msg = await ctx.bot.outbox.announce(ctx.bot.channel, message_text, pin=True)
         ctx.bot.game.current_day.vote_end_messages.append(end_msg.id)
         return end_msg, result
 
@@ -290,7 +285,7 @@ class Vote:
             ctx.bot.game.current_day.current_vote = None
 
             # Announcement
-            await safe_send(ctx.bot.channel, "Nomination cancelled.")
+            await ctx.bot.outbox.announce(ctx.bot.channel, "Nomination cancelled.")
 
             # Open PMs and Nominations
             await ctx.bot.game.current_day.open_pms(ctx)
@@ -302,9 +297,39 @@ class Vote:
             self.nominee.has_been_nominated = False
 
             # Cleanup pins
-            for idn in self.announcements:
-                msg = await ctx.bot.channel.fetch_message(idn)
-                if msg.pinned:
-                    await msg.unpin()
+            await ctx.bot.game.pins.unpin(ctx.bot.channel, self.announcements)
 
         return
+
+    def to_state(self, writer: "StateWriter") -> Dict[str, Any]:
+        """Convert the vote to plain data."""
+        return {
+            "nominee": writer.player(self.nominee),
+            "nominator": writer.player(self.nominator),
+            "traveler": self.traveler,
+            "storyteller": self.storyteller,
+            "announcements": list(self.announcements),
+            "prevotes": [[writer.player(x), vt] for x, vt in self.prevotes.items()],
+            "position": self.position,
+            "votes": self.votes,
+            "voted": [writer.player(x) for x in self.voted],
+            "order": [writer.player(x) for x in self.order],
+            "majority": self.majority,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], reader: "StateReader") -> "Vote":
+        """Create a vote from plain data generated by to_state."""
+        vote = cls.__new__(cls)
+        vote.nominee = reader.player(state["nominee"])
+        vote.nominator = reader.player(state["nominator"])
+        vote.traveler = state["traveler"]
+        vote.storyteller = state["storyteller"]
+        vote.announcements = state["announcements"]
+        vote.prevotes = {reader.player(idn): vt for idn, vt in state["prevotes"]}
+        vote.position = state["position"]
+        vote.votes = state["votes"]
+        vote.voted = [reader.player(idn) for idn in state["voted"]]
+        vote.order = [reader.player(idn) for idn in state["order"]]
+        vote.majority = state["majority"]
+        return vote
@@ -202,6 +202,8 @@ def class_decorator_factory(func_name):
                     setattr(cls, func_name, wrapper_func)
                 for attribute in attributes:
                     setattr(cls, attribute[0], attribute[1])
+                if issubclass(cls, Effect):
+                    cls._build_tables()
                 return cls
 
             return class_decorator
@@ -0,0 +1,92 @@
+"""Contains the character_info function, for reading character metadata."""
+
+import json
+from os import stat
+from time import monotonic
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# The files character metadata is read from, by whether they hold playtest characters.
+_INFO_FILES = {
+    False: "resources/basegame/character_info.json",
+    True: "resources/playtest/character_info.json",
+}
+
+# How long, in seconds, loaded metadata is trusted before checking whether its file has
+# changed.
+_REVALIDATE_AFTER = 5.0
+
+
+class CharacterInfo(NamedTuple):
+    """The metadata of a character.
+
+    Attributes
+    ----------
+    name : str
+        The character's name.
+    rules : str
+        The character's rules text.
+    type : Optional[str]
+        The character's type, for instance "Townsfolk", if recorded.
+    icon : Optional[str]
+        The URL of the character's icon, if recorded.
+    """
+
+    name: str
+    rules: str
+    type: Optional[str] = None
+    icon: Optional[str] = None
+
+
+# file -> (its mtime when loaded, or None if it doesn't exist, and its records by name)
+_loaded: Dict[str, Tuple[Optional[int], Dict[str, CharacterInfo]]] = {}
+
+# file -> when its mtime was last checked
+_validated: Dict[str, float] = {}
+
+
+def _load(file_name: str) -> Dict[str, CharacterInfo]:
+    """Read the records in a metadata file."""
+    with open(file_name, "r") as fp:
+        data = json.load(fp)
+    return {
+        name: CharacterInfo(name, info["rules"], info.get("type"), info.get("icon"))
+        for name, info in data.items()
+    }
+
+
+def _records(file_name: str) -> Dict[str, CharacterInfo]:
+    """Determine the records in a metadata file, reloading them if it changed."""
+    if file_name in _loaded and monotonic() - _validated[file_name] < _REVALIDATE_AFTER:
+        return _loaded[file_name][1]
+    _validated[file_name] = monotonic()
+
+    try:
+        mtime = stat(file_name).st_mtime_ns  # type: Optional[int]
+    except FileNotFoundError:
+        mtime = None
+
+    if file_name not in _loaded or _loaded[file_name][0] != mtime:
+        _loaded[file_name] = (mtime, _load(file_name) if mtime is not None else {})
+
+    return _loaded[file_name][1]
+
+
+def character_info(name: str, playtest: bool = False) -> Optional[CharacterInfo]:
+    """Find a character's metadata.
+
+    Each file is read once and kept in memory, and reread when it changes, which is
+    checked at most every few seconds.
+
+    Parameters
+    ----------
+    name : str
+        The character's name.
+    playtest : bool
+        Whether the character is a playtest character.
+
+    Returns
+    -------
+    Optional[CharacterInfo]
+        The character's metadata, or None if there is none.
+    """
+    return _records(_INFO_FILES[playtest]).get(name)
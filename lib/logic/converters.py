@@ -4,9 +4,9 @@ from typing import TYPE_CHECKING, List, Optional, Type
 
 from discord.ext import commands
 
-from lib.logic.Script import script_list
+from lib.logic.Script import find_script
 from lib.utils import str_cleanup
-from resources.basegame import characters
+from resources.basegame.characters import load_character
 
 try:
     from resources.playtest import characters as playtestcharacters
@@ -44,21 +44,17 @@ def to_character(
     text = str_cleanup(argument)
 
     if script:
-        character: Type["Character"]
-        for character in script.character_list:
-            if text == character.__name__:
-                return character
+        character = script.find_character(text)
+        if character is not None:
+            return character
         raise commands.BadArgument(
             f'Character "{argument}" not found on the script {script.name}.'
         )
 
     try:
-        return getattr(characters, text)
-    except AttributeError:
-        if (
-            ctx.bot.playtest_role
-            in ctx.bot.server.get_member(ctx.message.author.id).roles
-        ):
+        return load_character(text)
+    except KeyError:
+        if ctx.bot.is_playtester(ctx.message.author):
             try:
                 character = getattr(playtestcharacters, text)
                 if ctx.bot.playtest:
@@ -98,17 +94,9 @@ def to_script(ctx: "Context", argument: str) -> "Script":
     Script
         The matching script.
     """
-    for script in script_list(
-        ctx,
-        playtest=ctx.bot.playtest_role
-        in ctx.bot.server.get_member(ctx.message.author.id).roles,
-    ):
-        if argument.lower() in script.name.lower() or argument.lower() in [
-            x.lower() for x in script.aliases
-        ]:
-            if script.playtest and not ctx.bot.playtest:
-                raise commands.BadArgument(
-                    "Playtest scripts are not enabled on this bot."
-                )
-            return script
-    raise commands.BadArgument(f'Script "{argument}" not found.')
+    script = find_script(argument, playtest=ctx.bot.is_playtester(ctx.message.author))
+    if script is None:
+        raise commands.BadArgument(f'Script "{argument}" not found.')
+    if script.playtest and not ctx.bot.playtest:
+        raise commands.BadArgument("Playtest scripts are not enabled on this bot.")
+    return script
@@ -6,7 +6,7 @@ from discord import Member
 from discord.ext import commands
 
 from lib.exceptions import PlayerNotFoundError
-from lib.preferences import load_preferences
+from lib.preferences import load_many_preferences, load_preferences
 from lib.utils import get_input, get_player
 
 if TYPE_CHECKING:
@@ -86,7 +86,7 @@ async def to_member(
         message_text += "\n({i}). ".format(i=possibilities.index(person) + 1)
         if (
             ctx.bot.game and person in ctx.bot.game.storytellers
-        ) or person in ctx.bot.storyteller_role.members:
+        ) or ctx.bot.is_storyteller(person):
             message_text += "**[ST]** "
         message_text += f"{load_preferences(person).nick}"
 
@@ -187,10 +187,11 @@ def _generate_possibilities(argument: str, possibilities: List[Member]) -> List[
     List[Member]
         The matching members.
     """
+    preferences = load_many_preferences(possibilities)
     out = []
     for person in possibilities:
         if (
-            argument.lower() in load_preferences(person).nick.lower()
+            argument.lower() in preferences[person.id].nick.lower()
             or argument.lower() in person.display_name.lower()
             or argument.lower() in person.name.lower()
         ):
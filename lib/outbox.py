@@ -0,0 +1,184 @@
+"""Contains the Outbox class, for scheduling the bot's outbound messages.
+
+Messages go out in one of two lanes. Announcements in the public channel are sent
+immediately and awaited by the caller. Notifications, for instance telling the
+storytellers that PMs have closed, are fire-and-forget: they are queued per destination
+for a short window, so a burst of notifications to the same storyteller arrives as one
+message, and they are held back while any announcement is in flight.
+
+Each destination is sent to by at most one task at a time, so messages to it keep their
+order and never race each other for its rate limit bucket, while different destinations
+are sent to concurrently. Rate limit responses themselves are handled by discord.py.
+
+Announcements made during a game are recorded in the game's MessageCache. Those which
+are pinned are recorded in its PinRegistry, and the storytellers are warned as the
+channel's pins run out.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Set
+
+from discord import Message
+from discord.abc import Messageable
+
+from lib.logic.PinRegistry import PIN_LIMIT
+from lib.utils import safe_send
+
+if TYPE_CHECKING:
+    from lib.bot import BOTCBot
+
+
+# The number of remaining pins at which the storytellers are warned.
+_PIN_WARNING = 5
+
+
+def _destination(target: Messageable) -> Hashable:
+    """Determine a key identifying where messages to target are sent."""
+    return getattr(target, "id", id(target))
+
+
+class Outbox:
+    """Schedules outbound messages in a high priority and a low priority lane.
+
+    Parameters
+    ----------
+    bot : BOTCBot
+        The bot sending the messages.
+    window : float
+        The number of seconds for which notifications are queued before being sent.
+
+    Attributes
+    ----------
+    bot
+    window
+    """
+
+    def __init__(self, bot: "BOTCBot", window: float = 0.5):
+        self.bot = bot
+        self.window = window
+        self._queued = {}  # type: Dict[Hashable, List[str]]
+        self._locks = {}  # type: Dict[Hashable, asyncio.Lock]
+        self._announcing = 0
+        self._idle = None  # type: Optional[asyncio.Event]
+        self._deliveries = set()  # type: Set[asyncio.Task]
+
+    @property
+    def idle(self) -> asyncio.Event:
+        """Determine the event set whenever no announcement is in flight.
+
+        Created lazily, so that it belongs to the bot's running loop.
+        """
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            self._idle.set()
+        return self._idle
+
+    def _lock(self, key: Hashable) -> asyncio.Lock:
+        """Determine the lock serializing sends to a destination."""
+        try:
+            return self._locks[key]
+        except KeyError:
+            lock = self._locks[key] = asyncio.Lock()
+            return lock
+
+    async def announce(
+        self, target: Messageable, text: str, pin: bool = False
+    ) -> Message:
+        """Send a message in the high priority lane.
+
+        Notifications wait until every announcement in flight has been sent.
+
+        Parameters
+        ----------
+        target : Messageable
+            The object to send the message to, usually the public channel.
+        text : str
+            The message to be sent.
+        pin : bool
+            Whether to pin the message.
+
+        Returns
+        -------
+        Message
+            The first message sent.
+        """
+        self._announcing += 1
+        self.idle.clear()
+        try:
+            async with self._lock(_destination(target)):
+                out = await safe_send(target, text)
+                if self.bot.game is not None:
+                    self.bot.game.message_cache.record(out)
+                if pin:
+                    await self.pin(out)
+                return out
+        finally:
+            self._announcing -= 1
+            if not self._announcing:
+                self.idle.set()
+
+    async def pin(self, message: Message):
+        """Pin a message, recording it in the current game's pin registry.
+
+        Rather than failing when the channel is out of pins, the message is left
+        unpinned, and the storytellers are told as the pins run low.
+        """
+        game = self.bot.game
+        if game is None:
+            await message.pin()
+            return
+
+        if not await game.pins.pin(message):
+            warning = (
+                f"The channel has reached the limit of {PIN_LIMIT} pins, so a message "
+                f"was not pinned: {message.jump_url}"
+            )
+        elif game.pins.remaining <= _PIN_WARNING:
+            warning = (
+                f"The channel has {game.pins.remaining} of {PIN_LIMIT} pins left. "
+                "Consider unpinning some messages."
+            )
+        else:
+            return
+
+        for st in game.storytellers:
+            self.notify(st.member, warning)
+
+    def notify(self, target: Messageable, text: str):
+        """Queue a message in the low priority lane, without waiting for it.
+
+        Notifications queued for the same destination within the window are joined
+        into a single message.
+
+        Parameters
+        ----------
+        target : Messageable
+            The object to send the message to, usually a storyteller.
+        text : str
+            The message to be sent.
+        """
+        key = _destination(target)
+        if key in self._queued:
+            self._queued[key].append(text)
+        else:
+            self._queued[key] = [text]
+            # the loop only holds weak references to tasks
+            task = self.bot.loop.create_task(self._deliver(key, target))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+    async def close(self):
+        """Wait for every queued notification to be delivered."""
+        while self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+    async def _deliver(self, key: Hashable, target: Messageable):
+        """Send everything queued for a destination at the end of the window."""
+        await asyncio.sleep(self.window)
+        texts = self._queued.pop(key)
+        async with self._lock(key):
+            await self.idle.wait()
+            try:
+                await safe_send(target, "\n".join(texts))
+            except Exception as e:  # nobody awaits a notification to handle this
+                self.bot.report_error("notify", e)
@@ -1,13 +1,115 @@
 """Contains the preferences class and load_preferences funciton."""
 
-from typing import Dict, Tuple, Optional, Union, TYPE_CHECKING
+import sqlite3
+from collections import OrderedDict
+from copy import deepcopy
+from os import listdir
+from os.path import isdir
+from time import monotonic
+from typing import Dict, Iterable, Optional, Tuple, Union, TYPE_CHECKING
 
-from dill import load, dump
+from dill import dumps, load, loads
 from discord import Member
 
 if TYPE_CHECKING:
     from lib.logic.Player import Player
 
+# The database holding every member's preferences, keyed by discord id.
+_DATABASE = "resources/preferences.db"
+
+# The legacy one-pickle-per-member directory, migrated into the database on creation.
+_LEGACY_DIRECTORY = "resources/preferences/"
+
+# The database's user_version once legacy preferences have been migrated into it.
+_MIGRATED = 1
+
+# The maximum number of members whose preferences are held in memory.
+_CACHE_SIZE = 4096
+
+# How long, in seconds, the cache is trusted before checking whether another bot
+# process has written to the database.
+_REVALIDATE_AFTER = 5.0
+
+# SQLite's default limit on the number of parameters in one statement.
+_MAX_PARAMETERS = 999
+
+# member id -> preferences, or None if the member has no stored preferences
+_cache: "OrderedDict[int, Optional[Preferences]]" = OrderedDict()
+
+# whether _cache holds every stored member, so that a miss means no preferences
+_complete = False
+
+_connection: Optional[sqlite3.Connection] = None
+_data_version: Optional[int] = None
+_validated = 0.0
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the preferences database, creating and migrating it if necessary."""
+    global _connection, _data_version
+
+    if _connection is None:
+        _connection = sqlite3.connect(_DATABASE)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS preferences "
+            "(id INTEGER PRIMARY KEY, data BLOB NOT NULL)"
+        )
+        _connection.commit()
+
+        # retried on every start until a migration has completed
+        if _connection.execute("PRAGMA user_version").fetchone()[0] < _MIGRATED:
+            migrate_preferences()
+            with _connection:
+                _connection.execute(f"PRAGMA user_version = {_MIGRATED}")
+        _data_version = _connection.execute("PRAGMA data_version").fetchone()[0]
+
+    return _connection
+
+
+def _revalidate():
+    """Drop the cache if another process has written to the database."""
+    global _complete, _data_version, _validated
+
+    connection = _connect()
+    if monotonic() - _validated < _REVALIDATE_AFTER:
+        return
+    _validated = monotonic()
+
+    # data_version only changes when a *different* connection commits
+    data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+    if data_version != _data_version:
+        _data_version = data_version
+        _cache.clear()
+        _complete = False
+
+
+def _remember(idn: int, preferences: Optional["Preferences"]):
+    """Store an entry in the cache, evicting the least recently used if necessary."""
+    global _complete
+
+    _cache[idn] = preferences
+    _cache.move_to_end(idn)
+    while len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+        _complete = False
+
+
+def _fetch(ids: Iterable[int]) -> Dict[int, "Preferences"]:
+    """Read the stored preferences of several members in as few queries as possible."""
+    connection = _connect()
+    ids = list(ids)
+    out = {}
+    for i in range(0, len(ids), _MAX_PARAMETERS):
+        chunk = ids[i : i + _MAX_PARAMETERS]
+        rows = connection.execute(
+            "SELECT id, data FROM preferences WHERE id IN "
+            f"({', '.join('?' * len(chunk))})",
+            chunk,
+        )
+        for idn, data in rows:
+            out[idn] = loads(data)
+    return out
+
 
 class Preferences:
     """Stores a member's global preferences.
@@ -55,8 +157,7 @@ class Preferences:
 
     def save_preferences(self):
         """Save preferences."""
-        with open("resources/preferences/" + str(self.id) + ".pckl", "wb") as file:
-            dump(self, file)
+        save_many_preferences([self])
 
     def get_emergency_vote(self, bot_id: int) -> Tuple[int, Optional[int]]:
         """Generate the (potentially bot-specific) emergency vote.
@@ -77,6 +178,25 @@ class Preferences:
             return self.emergency_vote
 
 
+def save_many_preferences(preferences: Iterable[Preferences]):
+    """Save several members' preferences in a single transaction.
+
+    Parameters
+    ----------
+    preferences : Iterable[Preferences]
+        The preferences to save.
+    """
+    connection = _connect()
+    preferences = list(preferences)
+    with connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO preferences (id, data) VALUES (?, ?)",
+            [(x.id, dumps(x)) for x in preferences],
+        )
+    for x in preferences:
+        _remember(x.id, deepcopy(x))
+
+
 def load_preferences(member: Union["Player", Member]) -> Preferences:
     """Load a member's preferences.
 
@@ -89,9 +209,108 @@ def load_preferences(member: Union["Player", Member]) -> Preferences:
     -------
     Preferences
         The member's preferences.
+
+    Notes
+    -----
+    Preferences are cached in memory after the first load, so repeated lookups (for
+    instance Player.nick) don't touch the database. The cache is dropped when another
+    bot process writes to the database. Each call returns a copy, so changes take
+    effect only once saved with save_preferences.
+    """
+    return load_many_preferences([member])[member.id]
+
+
+def load_many_preferences(
+    members: Iterable[Union["Player", Member]]
+) -> Dict[int, Preferences]:
+    """Load several members' preferences, querying the database at most once.
+
+    Parameters
+    ----------
+    members : Iterable[Union[Player, Member]]
+        The members whose preferences to load.
+
+    Returns
+    -------
+    Dict[int, Preferences]
+        The members' preferences, keyed by discord id.
+    """
+    _revalidate()
+
+    members = list(members)
+    found = {}
+    missing = []
+    for member in members:
+        if member.id in _cache:
+            _cache.move_to_end(member.id)
+        else:
+            missing.append(member.id)
+    if missing and not _complete:
+        found = _fetch(missing)
+        for idn in missing:
+            _remember(idn, found.get(idn))
+
+    out = {}
+    for member in members:
+        preferences = found.get(member.id) or _cache.get(member.id)
+        # members without stored preferences get defaults tracking their display name
+        # a copy, so that changes which are never saved don't reach the cache
+        out[member.id] = (
+            deepcopy(preferences) if preferences is not None else Preferences(member)
+        )
+    return out
+
+
+def preload_preferences():
+    """Bulk load every member's preferences into the cache.
+
+    Called once at startup, so that most lookups never query the database.
+    """
+    global _complete
+
+    _revalidate()
+    rows = _connect().execute(
+        "SELECT id, data FROM preferences LIMIT ?", (_CACHE_SIZE,)
+    ).fetchall()
+    _cache.clear()
+    for idn, data in rows:
+        _remember(idn, loads(data))
+    _complete = len(rows) < _CACHE_SIZE
+
+
+def migrate_preferences(directory: str = _LEGACY_DIRECTORY) -> int:
+    """Import one-pickle-per-member preferences files into the database.
+
+    This runs automatically when the database is opened, until it has completed once.
+    Members who already have preferences in the database keep them.
+
+    Parameters
+    ----------
+    directory : str
+        The directory containing the legacy preferences files.
+
+    Returns
+    -------
+    int
+        The number of members migrated.
     """
-    try:
-        with open("resources/preferences/" + str(member.id) + ".pckl", "rb") as file:
-            return load(file)
-    except FileNotFoundError:
-        return Preferences(member)
+    global _complete
+
+    if not isdir(directory):
+        return 0
+
+    preferences = []
+    for filename in listdir(directory):
+        if filename.endswith(".pckl"):
+            with open(directory + filename, "rb") as file:
+                preferences.append(load(file))
+
+    connection = _connect()
+    with connection:
+        connection.executemany(
+            "INSERT OR IGNORE INTO preferences (id, data) VALUES (?, ?)",
+            [(x.id, dumps(x)) for x in preferences],
+        )
+    _cache.clear()
+    _complete = False
+    return len(preferences)
@@ -0,0 +1,67 @@
+"""Contains the RoleIndex class."""
+
+from typing import AbstractSet, Dict, Iterable, Set, Union
+
+from discord import Guild, Member, User
+
+
+class RoleIndex:
+    """Tracks the members of the bot's roles as sets of ids.
+
+    Role.members scans every cached member of the guild each time it is accessed, so
+    checking membership through it gets slower as the guild grows. The index is built
+    once from the guild and then kept current from member updates, so membership
+    checks are constant time.
+
+    Parameters
+    ----------
+    role_ids : Iterable[int]
+        The ids of the roles to track.
+    """
+
+    def __init__(self, role_ids: Iterable[int]):
+        self._members = {idn: set() for idn in role_ids}  # type: Dict[int, Set[int]]
+
+    def build(self, guild: Guild):
+        """Rebuild the index from the guild's member cache."""
+        for idn, members in self._members.items():
+            members.clear()
+            role = guild.get_role(idn)
+            if role is not None:
+                members.update(member.id for member in role.members)
+
+    def update(self, member: Member):
+        """Update the index with a member's current roles."""
+        roles = {role.id for role in member.roles}
+        for idn, members in self._members.items():
+            if idn in roles:
+                members.add(member.id)
+            else:
+                members.discard(member.id)
+
+    def remove(self, member: Union[Member, User]):
+        """Remove a member who has left the guild from the index."""
+        for members in self._members.values():
+            members.discard(member.id)
+
+    def add_role(self, member: Union[Member, User], role_id: int):
+        """Record that a member was given a role.
+
+        The bot calls this after changing a member's roles itself, so the index is
+        current before the member update arrives.
+        """
+        if role_id in self._members:
+            self._members[role_id].add(member.id)
+
+    def remove_role(self, member: Union[Member, User], role_id: int):
+        """Record that a role was taken from a member."""
+        if role_id in self._members:
+            self._members[role_id].discard(member.id)
+
+    def has_role(self, member: Union[Member, User, int, None], role_id: int) -> bool:
+        """Determine whether a member, or a member id, has a role."""
+        return getattr(member, "id", member) in self._members.get(role_id, ())
+
+    def members(self, role_id: int) -> AbstractSet[int]:
+        """Determine the ids of the members with a role."""
+        return frozenset(self._members.get(role_id, ()))
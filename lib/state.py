@@ -0,0 +1,214 @@
+"""Contains tools for the versioned binary state format.
+
+Game objects convert themselves to plain data (dicts, lists, strings, numbers and
+datetimes) with to_state, and back with from_state. Classes are referenced by
+registry name rather than pickled, so a state survives code reloads, and players are
+interned by id, so each player and each message is written exactly once.
+"""
+
+import datetime
+import io
+import pickle
+import struct
+import sys
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Type
+
+if TYPE_CHECKING:
+    from lib.logic.Player import Player
+
+FORMAT_VERSION = 1
+
+_MAGIC = b"BOTC"
+_HEADER = struct.Struct(">4sH")
+
+# The only globals a state may reference; everything else is plain data.
+_SAFE_GLOBALS = {
+    ("datetime", "datetime"): datetime.datetime,
+    ("datetime", "timedelta"): datetime.timedelta,
+    ("datetime", "timezone"): datetime.timezone,
+}
+
+
+class StateError(ValueError):
+    """The data is not a valid state."""
+
+
+def class_name(cls: Type) -> str:
+    """Determine the registry name of a class."""
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def resolve_class(name: str) -> Type:
+    """Find the class with a registry name.
+
+    The class is looked up in its module at call time, so reloaded modules resolve to
+    their new classes.
+    """
+    module_name, qualname = name.split(":")
+    try:
+        out = sys.modules[module_name]
+    except KeyError:
+        out = import_module(module_name)
+    for attribute in qualname.split("."):
+        out = getattr(out, attribute)
+    return out
+
+
+class _StateUnpickler(pickle.Unpickler):
+    """Refuses to load anything but plain data."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        """Allow only whitelisted globals."""
+        try:
+            return _SAFE_GLOBALS[(module, name)]
+        except KeyError:
+            raise StateError(f"{module}.{name} is not allowed in a state.")
+
+
+def is_state(data: bytes) -> bool:
+    """Determine whether data is in the state format, as opposed to a legacy pickle."""
+    return data[: len(_MAGIC)] == _MAGIC
+
+
+def dumps(state: Any) -> bytes:
+    """Serialize a state."""
+    return _HEADER.pack(_MAGIC, FORMAT_VERSION) + pickle.dumps(state, protocol=4)
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize a state.
+
+    Raises
+    ------
+    StateError
+        If data is not a state, or was written by a newer version.
+    """
+    if not is_state(data):
+        raise StateError("Not a state.")
+    _, version = _HEADER.unpack_from(data)
+    if version > FORMAT_VERSION:
+        raise StateError(f"State version {version} is newer than {FORMAT_VERSION}.")
+    return _StateUnpickler(io.BytesIO(data[_HEADER.size :])).load()
+
+
+class StateWriter:
+    """Interns players and messages while a game is converted to a state.
+
+    Attributes
+    ----------
+    players : Dict[int, Player]
+        Every player referenced so far, by id.
+    messages : List[Dict[str, Any]]
+        The state of every message referenced so far.
+    player_states : Dict[int, Dict[str, Any]]
+        The state of every player converted so far, by id.
+    histories : Dict[int, List[int]]
+        Every message history interned so far, as message indices, by player id.
+    """
+
+    def __init__(self, message_offset: int = 0):
+        self.players: Dict[int, "Player"] = {}
+        self.messages: List[Dict[str, Any]] = []
+        self.player_states: Dict[int, Dict[str, Any]] = {}
+        self.histories: Dict[int, List[int]] = {}
+        self._message_offset = message_offset
+        self._message_indices: Dict[int, int] = {}
+
+    def player(self, player: "Player") -> int:
+        """Reference a player, returning their id."""
+        self.players.setdefault(player.id, player)
+        return player.id
+
+    def message(self, message: Dict[str, Any]) -> int:
+        """Reference a message history entry, returning its index."""
+        try:
+            return self._message_indices[id(message)]
+        except KeyError:
+            index = self._message_offset + len(self.messages)
+            self._message_indices[id(message)] = index
+            self.messages.append(
+                {
+                    "from": self.player(message["from"]),
+                    "to": self.player(message["to"]),
+                    "content": message["content"],
+                    "day": message["day"],
+                    "time": message["time"],
+                }
+            )
+            return index
+
+    def finish(
+        self, histories: bool = False
+    ) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, List[int]]]:
+        """Convert every referenced player, and optionally their message histories.
+
+        Converting a player or a history can reference further players, so this
+        repeats until nothing new is referenced. Players converted by an earlier call
+        are not converted again.
+
+        Parameters
+        ----------
+        histories : bool
+            Whether to intern the players' whole message histories.
+
+        Returns
+        -------
+        Dict[int, Dict[str, Any]]
+            The state of every referenced player, by id.
+        Dict[int, List[int]]
+            Every interned message history, by player id.
+        """
+        while len(self.player_states) < len(self.players):
+            for idn, player in list(self.players.items()):
+                if idn not in self.player_states:
+                    self.player_states[idn] = player.to_state(self)
+                    if histories:
+                        self.histories[idn] = [
+                            self.message(message) for message in player.message_history
+                        ]
+        return self.player_states, self.histories
+
+
+class StateReader:
+    """Resolves interned players and messages while a game is built from a state.
+
+    Attributes
+    ----------
+    players : Dict[int, Player]
+        Every player in the state, by id. Their members are still ids.
+    messages : List[Dict[str, Any]]
+        Every message history entry in the state.
+    """
+
+    def __init__(
+        self,
+        player_states: Dict[int, Dict[str, Any]],
+        messages: List[Dict[str, Any]],
+        histories: Dict[int, List[int]],
+    ):
+        from lib.logic.Player import Player
+
+        # players are created before their effects, which may reference each other
+        self.players = {
+            idn: Player.from_state(state) for idn, state in player_states.items()
+        }
+        for idn, state in player_states.items():
+            self.players[idn].effects_from_state(state, self)
+
+        self.messages = [
+            {
+                "from": self.players[message["from"]],
+                "to": self.players[message["to"]],
+                "content": message["content"],
+                "day": message["day"],
+                "time": message["time"],
+            }
+            for message in messages
+        ]
+        for idn, indices in histories.items():
+            self.players[idn].message_history = [self.messages[i] for i in indices]
+
+    def player(self, idn: int) -> "Player":
+        """Resolve a player id."""
+        return self.players[idn]
@@ -1,19 +1,28 @@
 """Contains several utilities, generally not for game logic management."""
 
+import asyncio
 import re
-from typing import TYPE_CHECKING, Any, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Pattern, Sequence, Tuple, Union
 
-from discord import HTTPException, Message
+from discord import Embed, Message
 from discord.abc import Messageable
 from discord.ext import commands
 
-from lib.exceptions import PlayerNotFoundError
-
 if TYPE_CHECKING:
+    from lib.bot import BOTCBot
     from lib.logic.Game import Game
     from lib.logic.Player import Player
     from lib.typings.context import Context
 
+# The maximum number of characters in a message, and in an embed's description.
+MESSAGE_LIMIT = 2000
+EMBED_LIMIT = 2048
+
+_FENCE = "```"
+
+# str_cleanup's compiled matchers, by the delimiters they match
+_cleanup_patterns = {}  # type: Dict[Tuple[str, ...], Pattern[str]]
+
 
 async def aexec(code: str, ctx: "Context") -> Any:
     """Execute code asynchronously.
@@ -58,19 +67,10 @@ def get_player(game: "Game", idn: int, include_storytellers: bool = True) -> "Pl
 
     Raises
     ------
-    ValueError
+    PlayerNotFoundError
         If no matching player is found.
     """
-    if include_storytellers:
-        for st in game.storytellers:
-            if st.member.id == idn:
-                return st
-
-    for player in game.seating_order:
-        if player.member.id == idn:
-            return player
-
-    raise PlayerNotFoundError
+    return game.get_player(idn, include_storytellers)
 
 
 async def get_input(ctx: "Context", text: str, timeout: int = 200) -> str:
@@ -139,16 +139,93 @@ def str_cleanup(text: str, chars: Tuple[str, ...] = (",", " ", "-", "'", "_")) -
     Notes
     -----
     Uses a regex matcher for matching all of chars, so does not work with special
-    characters, could potentially be sanitized.
+    characters, could potentially be sanitized. The matcher is compiled once per chars.
+    """
+    try:
+        pattern = _cleanup_patterns[chars]
+    except KeyError:
+        # the regex matcher is a disjoint of all the given characters
+        pattern = _cleanup_patterns[chars] = re.compile("|".join(chars))
+    return "".join(s.capitalize() for s in pattern.split(text))
+
+
+def _toggle_fence(fence: str, line: str) -> str:
+    """Determine the open code block fence after line, or "" if there is none."""
+    if line.count(_FENCE) % 2 == 0:
+        return fence
+    if fence:
+        return ""
+    language = re.search(r"```(\w*)\s*$", line)
+    return _FENCE + (language.group(1) if language else "")
+
+
+def _split_line(line: str, width: int) -> Tuple[str, str]:
+    """Split a line which is too long, between words if possible."""
+    cut = line.rfind(" ", 0, width + 1)
+    if cut <= 0:
+        return line[:width], line[width:]
+    return line[:cut], line[cut + 1 :]
+
+
+def _add_chunk(chunks: List[str], chunk: str):
+    """Append a chunk, unless it is blank and so can't be sent."""
+    if chunk.strip():
+        chunks.append(chunk)
+
+
+def chunk_message(text: str, limit: int = MESSAGE_LIMIT) -> List[str]:
+    """Split text into chunks short enough to send.
+
+    Text is split between lines where possible, and overlong lines between words. A code
+    block split across chunks is closed at the end of one and reopened, with the same
+    language, at the start of the next, so the markdown renders the same.
+
+    Parameters
+    ----------
+    text : str
+        The text to split.
+    limit : int
+        The maximum number of characters per chunk.
+
+    Returns
+    -------
+    List[str]
+        The chunks, in order. Blank chunks are dropped, unless text itself is blank.
     """
-    # the regex matcher is a disjoint of all the given characters
-    regex = "|".join(chars)
-    split = re.split(regex, text)
-    return "".join(s.capitalize() for s in split)
+    chunks = []  # type: List[str]
+    lines = []  # type: List[str]
+    size = 0
+    fence = ""  # the line which opened the current code block, if any
+
+    pending = text.split("\n")[::-1]
+    while pending:
+        line = pending.pop()
+
+        # make sure the line fits in a fresh chunk, even within a code block
+        width = limit - (len(fence) + 2 * len(_FENCE) - 1 if fence else len(_FENCE) + 1)
+        if len(line) > width:
+            line, rest = _split_line(line, width)
+            pending.append(rest)
+
+        after = _toggle_fence(fence, line)
+        closing = len(_FENCE) + 1 if after else 0
+        if lines and size + 1 + len(line) + closing > limit:
+            _add_chunk(chunks, "\n".join((lines + [_FENCE]) if fence else lines))
+            lines = [fence] if fence else []
+            size = len(fence)
 
+        size = size + 1 + len(line) if lines else len(line)
+        lines.append(line)
+        fence = after
 
-async def safe_send(target: Messageable, msg: str, pin: bool = False) -> Message:
-    """Send a message with protection from message length errors.
+    _add_chunk(chunks, "\n".join(lines))
+    return chunks or [text]
+
+
+async def safe_send(
+    target: Messageable, msg: str, pin: bool = False, embed: bool = False
+) -> Message:
+    """Send a message, split into as many messages as its length requires.
 
     Functionally a wrapper of target.send.
 
@@ -160,21 +237,25 @@ async def safe_send(target: Messageable, msg: str, pin: bool = False) -> Message
         The message to be sent.
     pin: bool
         Whether to pin the message.
+    embed: bool
+        Whether to send the message as embeds, which suits long structured text.
 
     Returns
     -------
     Message
         The first message sent this way.
     """
-    try:
-        out = await target.send(msg)
-    except HTTPException as e:
-        if e.code != 50035:
-            raise
-
-        n = len(msg) // 2
-        out = await safe_send(target, msg[:n])
-        await safe_send(target, msg[n:])
+    if embed:
+        sends = [
+            {"embed": Embed(description=chunk)}
+            for chunk in chunk_message(msg, EMBED_LIMIT)
+        ]
+    else:
+        sends = [{"content": chunk} for chunk in chunk_message(msg)]
+
+    out = await target.send(**sends[0])
+    for kwargs in sends[1:]:
+        await target.send(**kwargs)
 
     if pin:
         await out.pin()
@@ -182,6 +263,43 @@ async def safe_send(target: Messageable, msg: str, pin: bool = False) -> Message
     return out
 
 
+async def safe_send_all(
+    bot: "BOTCBot", sends: Sequence[Tuple[Messageable, str]]
+) -> List[Union[Message, Exception]]:
+    """Send several messages concurrently, isolating their failures.
+
+    A failed send is reported with bot.report_error, but does not stop the others.
+    Messages to the gameplay channel are sent as announcements through the outbox.
+
+    Parameters
+    ----------
+    bot : BOTCBot
+        The bot sending the messages.
+    sends : Sequence[Tuple[Messageable, str]]
+        The objects to send to, and the messages to send them.
+
+    Returns
+    -------
+    List[Union[Message, Exception]]
+        For each send, the first message sent, or the exception if it failed.
+    """
+    results = await asyncio.gather(
+        *(
+            bot.outbox.announce(target, msg)
+            if target == bot.channel
+            else safe_send(target, msg)
+            for target, msg in sends
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result  # cancellation, which must not be swallowed
+        if isinstance(result, Exception):
+            bot.report_error("safe_send_all", result)
+    return results
+
+
 def list_to_plural_string(initial_list: List[str], alt: str) -> Tuple[str, bool]:
     """Convert a list of strings into a list with appropriate punctuation.
 
@@ -225,4 +343,4 @@ def safe_bug_report(ctx: "Context") -> bool:
     For instance, it's unsafe to send those messages in public.
     This is because they may contain privileged game info.
     """
-    return ctx.guild is None and ctx.author in ctx.bot.storyteller_role.members
+    return ctx.guild is None and ctx.bot.is_storyteller(ctx.author)
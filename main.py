@@ -56,11 +56,13 @@ except KeyError as error:
 async def command_cleanup(ctx: Context):
     """Run after every command.
 
-    Backs up the bot and updates the status.
+    Schedules a backup and updates the status.
     """
     if ctx.bot.game and ctx.bot.game.current_day:
         await ctx.bot.game.reseat(ctx, ctx.bot.game.seating_order)
-    ctx.bot.backup()
+    # failed commands may still have changed the game partway through, and the
+    # writer skips the disk entirely if the serialized game is unchanged
+    ctx.bot.backups.mark_dirty()
     await ctx.bot.update_status()
 
 
@@ -23,7 +23,7 @@ class Chef(Townsfolk):
         numb = 0
         for character in ctx.bot.game.seating_order:
             if character.is_status(ctx.bot.game, "evil", registers=True):
-                if character.neighbors(ctx.bot.game)[1].is_status(
+                if ctx.bot.game.seating.next(character).is_status(
                     ctx.bot.game, "evil", registers=True
                 ):
                     numb += 1
@@ -20,9 +20,9 @@ class _VigormortisDead(Dead):
     # TODO: instead of checking if the vig is functioning spawn a new effect
     # as part of the behavior of source_drunkpoisoned_cleanup and source_death_cleanup
     # which stops affected_player from functioning
-    # checking if the vig is functioning probably causes recursion errors somewhere
-    # ex if the vig kills a poisoner and then the poisoner targets a vig
-    # although this is an unresolved issue in the game's rules as well
+    # checking if the vig is functioning can be circular, ex if the vig kills a
+    # poisoner and then the poisoner targets the vig; Game.status_evaluator resolves
+    # that loop, but this is an unresolved issue in the game's rules as well
 
     def not_functioning(self, game: "Game"):
         """Allow minions to function while killed by Vigormortis."""
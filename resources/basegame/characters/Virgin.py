@@ -7,7 +7,6 @@ from lib.logic.charcreation import if_functioning, onetime_use
 from lib.logic.Day import generate_nomination_message_text
 from lib.logic.Effect import UsedAbility
 from lib.logic.Player import Player
-from lib.utils import safe_send
 
 if TYPE_CHECKING:
     from lib.typings.context import Context
@@ -34,9 +33,11 @@ class Virgin(Townsfolk):
         If nominee is the Virgin and nominator is a townsfolk, execute nominator.
         """
         if nominee == self.parent:
-            self.parent.add_effect(ctx, UsedAbility, self.parent)
-            if enabled and nominator.is_status(ctx, "townsfolk", registers=True):
-                await safe_send(
+            self.parent.add_effect(ctx.bot.game, UsedAbility, self.parent)
+            if enabled and nominator.is_status(
+                ctx.bot.game, "townsfolk", registers=True
+            ):
+                await ctx.bot.outbox.announce(
                     ctx.bot.channel,
                     generate_nomination_message_text(
                         ctx, nominator, nominee, traveler=False, proceed=False
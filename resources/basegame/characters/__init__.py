@@ -1,75 +1,123 @@
-"""Contains basegame characters."""
+"""Contains basegame characters.
 
-from .Artist import Artist
-from .Assassin import Assassin
-from .Barber import Barber
-from .Baron import Baron
-from .Butler import Butler
-from .Cerenovus import Cerenovus
-from .Chambermaid import Chambermaid
-from .Chef import Chef
-from .Clockmaker import Clockmaker
-from .Courtier import Courtier
-from .DevilSAdvocate import DevilSAdvocate
-from .Dreamer import Dreamer
-from .Drunk import Drunk
-from .Empath import Empath
-from .EvilTwin import EvilTwin
-from .Exorcist import Exorcist
-from .FangGu import FangGu
-from .Flowergirl import Flowergirl
-from .Fool import Fool
-from .FortuneTeller import FortuneTeller
-from .Gambler import Gambler
-from .Godfather import Godfather
-from .Goon import Goon
-from .Gossip import Gossip
-from .Grandmother import Grandmother
-from .Gunslinger import Gunslinger
-from .Imp import Imp
-from .Innkeeper import Innkeeper
-from .Investigator import Investigator
-from .Juggler import Juggler
-from .Klutz import Klutz
-from .Librarian import Librarian
-from .Lunatic import Lunatic
-from .Mastermind import Mastermind
-from .Mathematician import Mathematician
-from .Mayor import Mayor
-from .Minstrel import Minstrel
-from .Monk import Monk
-from .Moonchild import Moonchild
-from .Mutant import Mutant
-from .NoDashii import NoDashii
-from .Oracle import Oracle
-from .Pacifist import Pacifist
-from .Philosopher import Philosopher
-from .PitHag import PitHag
-from .Po import Po
-from .Poisoner import Poisoner
-from .Professor import Professor
-from .Pukka import Pukka
-from .Ravenkeeper import Ravenkeeper
-from .Recluse import Recluse
-from .Sage import Sage
-from .Sailor import Sailor
-from .Saint import Saint
-from .Savant import Savant
-from .ScarletWoman import ScarletWoman
-from .Seamstress import Seamstress
-from .Shabaloth import Shabaloth
-from .Slayer import Slayer
-from .SnakeCharmer import SnakeCharmer
-from .Soldier import Soldier
-from .Spy import Spy
-from .Sweetheart import Sweetheart
-from .TeaLady import TeaLady
-from .Tinker import Tinker
-from .TownCrier import TownCrier
-from .Undertaker import Undertaker
-from .Vigormortis import Vigormortis
-from .Virgin import Virgin
-from .Vortox import Vortox
-from .Washerwoman import Washerwoman
-from .Witch import Witch
-from .Zombuul import Zombuul
+Each character is imported from its module the first time it is looked up with
+load_character, so only the characters actually in use are ever loaded.
+"""
+
+from importlib import import_module
+from typing import Any, Dict, List
+
+# character name -> the module defining it, relative to this package
+_MANIFEST = {
+    "Artist": ".Artist",
+    "Assassin": ".Assassin",
+    "Barber": ".Barber",
+    "Baron": ".Baron",
+    "Butler": ".Butler",
+    "Cerenovus": ".Cerenovus",
+    "Chambermaid": ".Chambermaid",
+    "Chef": ".Chef",
+    "Clockmaker": ".Clockmaker",
+    "Courtier": ".Courtier",
+    "DevilSAdvocate": ".DevilSAdvocate",
+    "Dreamer": ".Dreamer",
+    "Drunk": ".Drunk",
+    "Empath": ".Empath",
+    "EvilTwin": ".EvilTwin",
+    "Exorcist": ".Exorcist",
+    "FangGu": ".FangGu",
+    "Flowergirl": ".Flowergirl",
+    "Fool": ".Fool",
+    "FortuneTeller": ".FortuneTeller",
+    "Gambler": ".Gambler",
+    "Godfather": ".Godfather",
+    "Goon": ".Goon",
+    "Gossip": ".Gossip",
+    "Grandmother": ".Grandmother",
+    "Gunslinger": ".Gunslinger",
+    "Imp": ".Imp",
+    "Innkeeper": ".Innkeeper",
+    "Investigator": ".Investigator",
+    "Juggler": ".Juggler",
+    "Klutz": ".Klutz",
+    "Librarian": ".Librarian",
+    "Lunatic": ".Lunatic",
+    "Mastermind": ".Mastermind",
+    "Mathematician": ".Mathematician",
+    "Mayor": ".Mayor",
+    "Minstrel": ".Minstrel",
+    "Monk": ".Monk",
+    "Moonchild": ".Moonchild",
+    "Mutant": ".Mutant",
+    "NoDashii": ".NoDashii",
+    "Oracle": ".Oracle",
+    "Pacifist": ".Pacifist",
+    "Philosopher": ".Philosopher",
+    "PitHag": ".PitHag",
+    "Po": ".Po",
+    "Poisoner": ".Poisoner",
+    "Professor": ".Professor",
+    "Pukka": ".Pukka",
+    "Ravenkeeper": ".Ravenkeeper",
+    "Recluse": ".Recluse",
+    "Sage": ".Sage",
+    "Sailor": ".Sailor",
+    "Saint": ".Saint",
+    "Savant": ".Savant",
+    "ScarletWoman": ".ScarletWoman",
+    "Seamstress": ".Seamstress",
+    "Shabaloth": ".Shabaloth",
+    "Slayer": ".Slayer",
+    "SnakeCharmer": ".SnakeCharmer",
+    "Soldier": ".Soldier",
+    "Spy": ".Spy",
+    "Sweetheart": ".Sweetheart",
+    "TeaLady": ".TeaLady",
+    "Tinker": ".Tinker",
+    "TownCrier": ".TownCrier",
+    "Undertaker": ".Undertaker",
+    "Vigormortis": ".Vigormortis",
+    "Virgin": ".Virgin",
+    "Vortox": ".Vortox",
+    "Washerwoman": ".Washerwoman",
+    "Witch": ".Witch",
+    "Zombuul": ".Zombuul",
+}
+
+__all__ = list(_MANIFEST)
+
+# character name -> the character, once imported
+_loaded = {}  # type: Dict[str, Any]
+
+
+def load_character(name: str) -> Any:
+    """Find a character by class name, importing it on first use.
+
+    Use this rather than getattr: once a character's module has been imported by its
+    path, for instance by lib.state.resolve_class, the package attribute with the
+    character's name is the module rather than the class.
+
+    Raises
+    ------
+    KeyError
+        If there is no such character.
+    """
+    try:
+        return _loaded[name]
+    except KeyError:
+        character = getattr(import_module(_MANIFEST[name], __name__), name)
+        _loaded[name] = character
+        return character
+
+
+def __getattr__(name: str) -> Any:
+    """Import a character on first access."""
+    try:
+        return load_character(name)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    """List the characters, whether or not they have been imported."""
+    return sorted(set(globals()) | set(_MANIFEST))
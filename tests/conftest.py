@@ -0,0 +1,47 @@
+"""Shared fixtures for the tests.
+
+Imports needing discord.py are made inside the fixtures, so that tests which don't use
+them still run without it.
+"""
+
+from datetime import datetime
+
+import pytest
+
+# The characters seated by the game fixture, in order.
+CHARACTERS = ("Chef", "Empath", "Poisoner", "Imp", "Saint")
+
+
+def make_player(idn: int, character: str):
+    """Create a player whose member is still an id, as in a restored game."""
+    from lib.logic.Player import Player
+    from resources.basegame.characters import load_character
+
+    return Player(idn, load_character(character), None)
+
+
+def message(frm, to, content: str) -> dict:
+    """Create a message history entry."""
+    return {
+        "from": frm,
+        "to": to,
+        "content": content,
+        "day": 1,
+        "time": datetime(2020, 1, 1),
+    }
+
+
+@pytest.fixture
+def game():
+    """A game of five players and one storyteller, before the first night."""
+    pytest.importorskip("discord")
+    from lib.logic.Character import Storyteller
+    from lib.logic.Game import Game
+    from lib.logic.Player import Player
+    from lib.logic.Script import Script
+    from resources.basegame.characters import load_character
+
+    players = [make_player(i + 1, x) for i, x in enumerate(CHARACTERS)]
+    storyteller = Player(100, Storyteller, None)
+    script = Script("Test", [load_character(x) for x in CHARACTERS])
+    return Game(players, 1000, script, [storyteller])
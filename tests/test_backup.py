@@ -0,0 +1,166 @@
+"""Tests for lib.backup."""
+
+import asyncio
+from os.path import isfile
+
+import pytest
+
+pytest.importorskip("discord")
+
+import lib.backup  # noqa: E402
+from lib.backup import (BackupWriter, IncompleteJournalError,  # noqa: E402
+                        journal_path, load_backup)
+from tests.conftest import message  # noqa: E402
+
+
+class _Bot:
+    """The parts of BOTCBot which BackupWriter uses."""
+
+    def __init__(self, game, directory):
+        self.game = game
+        self.directory = directory
+        self.loop = None
+        self.errors = []
+
+    def backup_path(self, file_name="current_game.pckl"):
+        return str(self.directory / file_name)
+
+    def report_error(self, event, error):
+        self.errors.append((event, error))
+
+
+@pytest.fixture
+def bot(game, tmp_path):
+    return _Bot(game, tmp_path)
+
+
+def _flush(bot, writer):
+    async def flush():
+        bot.loop = asyncio.get_running_loop()
+        await writer.flush()
+
+    asyncio.run(flush())
+
+
+def _journal_size(bot):
+    path = journal_path(bot.backup_path())
+    if not isfile(path):
+        return 0
+    with open(path, "rb") as file:
+        return len(file.read())
+
+
+def test_first_flush_writes_a_snapshot(bot):
+    writer = BackupWriter(bot)
+    _flush(bot, writer)
+
+    assert isfile(bot.backup_path())
+    assert _journal_size(bot) == 0
+    restored, _, entries, error = load_backup(bot.backup_path())
+    assert entries == 0
+    assert error is None
+    assert [x.id for x in restored.seating_order] == [1, 2, 3, 4, 5]
+
+
+def test_changes_are_journaled_and_replayed(bot, game):
+    writer = BackupWriter(bot)
+    _flush(bot, writer)
+
+    chef, empath = game.seating_order[:2]
+    chef.dead_votes = 0
+    entry = message(chef, empath, "hello")
+    chef.message_history.append(entry)
+    empath.message_history.append(entry)
+    _flush(bot, writer)
+
+    assert _journal_size(bot) > 0
+    restored, _, entries, error = load_backup(bot.backup_path())
+    assert entries == 1
+    assert error is None
+    chef, empath = restored.seating_order[:2]
+    assert chef.dead_votes == 0
+    assert [x["content"] for x in chef.message_history] == ["hello"]
+    assert chef.message_history[0] is empath.message_history[0]
+    assert chef.message_history[0]["to"] is empath
+
+
+def test_unchanged_games_append_nothing(bot):
+    writer = BackupWriter(bot)
+    _flush(bot, writer)
+    # the first entry after a snapshot records the working set's digest
+    _flush(bot, writer)
+    size = _journal_size(bot)
+    _flush(bot, writer)
+    _flush(bot, writer)
+
+    assert _journal_size(bot) == size
+
+
+def test_truncated_entries_are_ignored(bot, game):
+    writer = BackupWriter(bot)
+    _flush(bot, writer)
+    game.seating_order[0].dead_votes = 0
+    _flush(bot, writer)
+    game.seating_order[1].dead_votes = 0
+    _flush(bot, writer)
+
+    # cut the last entry short, as a crash mid-append would
+    path = journal_path(bot.backup_path())
+    with open(path, "rb") as file:
+        data = file.read()
+    with open(path, "wb") as file:
+        file.write(data[:-3])
+
+    restored, _, entries, error = load_backup(bot.backup_path())
+    assert entries == 1
+    assert isinstance(error, IncompleteJournalError)
+    assert restored.seating_order[0].dead_votes == 0
+    assert restored.seating_order[1].dead_votes == 1
+
+
+def test_journal_is_compacted(bot, game, monkeypatch):
+    monkeypatch.setattr(lib.backup, "_COMPACT_AFTER", 2)
+    writer = BackupWriter(bot)
+    _flush(bot, writer)
+    for player in game.seating_order[:2]:
+        player.dead_votes = 0
+        _flush(bot, writer)
+    assert _journal_size(bot) > 0
+
+    game.seating_order[2].dead_votes = 0
+    _flush(bot, writer)
+
+    assert _journal_size(bot) == 0
+    restored, _, entries, _ = load_backup(bot.backup_path())
+    assert entries == 0
+    assert [x.dead_votes for x in restored.seating_order] == [0, 0, 0, 1, 1]
+
+
+def test_journaling_continues_after_a_restore(bot, game):
+    writer = BackupWriter(bot)
+    _flush(bot, writer)
+    game.seating_order[0].dead_votes = 0
+    _flush(bot, writer)
+
+    restored, state, entries, _ = load_backup(bot.backup_path())
+    bot.game = restored
+    writer = BackupWriter(bot)
+    writer.adopt(restored, state, entries)
+    restored.seating_order[1].dead_votes = 0
+    _flush(bot, writer)
+
+    restored, _, entries, _ = load_backup(bot.backup_path())
+    assert entries == 2
+    assert [x.dead_votes for x in restored.seating_order[:3]] == [0, 0, 1]
+
+
+def test_backup_is_deleted_when_the_game_ends(bot):
+    writer = BackupWriter(bot)
+    _flush(bot, writer)
+
+    # a failed flush forgets the game, which must not keep its backup alive
+    writer.adopt(bot.game, None, 0)
+    bot.game = None
+    _flush(bot, writer)
+
+    assert not isfile(bot.backup_path())
@@ -0,0 +1,31 @@
+"""Tests for resources.basegame.characters."""
+
+import pytest
+
+pytest.importorskip("discord")
+
+from lib.logic.Character import Character  # noqa: E402
+from lib.logic.Script import find_script  # noqa: E402
+from lib.state import resolve_class  # noqa: E402
+from resources.basegame.characters import load_character  # noqa: E402
+
+
+def test_loads_characters_by_name():
+    character = load_character("Imp")
+    assert issubclass(character, Character)
+    assert character is load_character("Imp")
+
+
+def test_unknown_characters_raise_key_error():
+    with pytest.raises(KeyError):
+        load_character("NotACharacter")
+
+
+def test_loads_characters_after_their_module_is_imported_by_path():
+    # resolve_class imports the module, which binds it as a package attribute
+    imp = resolve_class("resources.basegame.characters.Imp:Imp")
+    assert load_character("Imp") is imp
+
+    script = find_script("trouble")
+    assert script is not None
+    assert imp in script.compiled.characters
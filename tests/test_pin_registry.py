@@ -0,0 +1,66 @@
+"""Tests for lib.logic.PinRegistry."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("discord")
+
+from discord import HTTPException  # noqa: E402
+
+from lib.logic.PinRegistry import PIN_LIMIT, PinRegistry  # noqa: E402
+
+
+class _Response:
+    status = 400
+    reason = "Bad Request"
+
+
+class _Channel:
+    """A channel holding pinned messages, which refuses pins past the limit."""
+
+    def __init__(self):
+        self.pinned = []
+
+    async def pins(self):
+        return list(self.pinned)
+
+
+class _Message:
+    def __init__(self, idn, channel):
+        self.id = idn
+        self.channel = channel
+
+    async def pin(self):
+        if len(self.channel.pinned) >= PIN_LIMIT:
+            raise HTTPException(
+                _Response(), {"code": 30003, "message": "Maximum pins reached"}
+            )
+        self.channel.pinned.append(self)
+
+
+def test_pins_are_recorded():
+    channel = _Channel()
+    pins = PinRegistry()
+    assert asyncio.run(pins.pin(_Message(1, channel)))
+    assert 1 in pins
+    assert pins.remaining == PIN_LIMIT - 1
+
+
+def test_pins_stop_at_the_local_limit():
+    channel = _Channel()
+    pins = PinRegistry(external=PIN_LIMIT)
+    assert not asyncio.run(pins.pin(_Message(1, channel)))
+    assert not channel.pinned
+
+
+def test_pins_made_by_hand_are_recounted_at_the_limit():
+    channel = _Channel()
+    pins = PinRegistry()
+    asyncio.run(pins.pin(_Message(1, channel)))
+    channel.pinned += [_Message(i, channel) for i in range(2, PIN_LIMIT + 1)]
+
+    assert not asyncio.run(pins.pin(_Message(100, channel)))
+    assert 100 not in pins
+    assert pins.external == PIN_LIMIT - 1
+    assert pins.remaining == 0
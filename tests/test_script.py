@@ -0,0 +1,108 @@
+"""Tests for finding scripts in lib.logic.Script."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("discord")
+
+from lib.logic import Script as script_module  # noqa: E402
+from lib.logic.Script import Script, find_script, find_script_named  # noqa: E402
+from resources.basegame.characters import load_character  # noqa: E402
+
+
+@pytest.fixture
+def saved(tmp_path, monkeypatch):
+    """Save scripts to a temporary directory, searched after the default scripts."""
+    directories = {False: f"{tmp_path}/basegame/", True: f"{tmp_path}/playtest/"}
+    for directory in directories.values():
+        Path(directory).mkdir()
+    monkeypatch.setattr(script_module, "_SCRIPT_DIRECTORIES", directories)
+    monkeypatch.setattr(script_module, "_loaded", {})
+    monkeypatch.setattr(script_module, "_validated", {})
+    monkeypatch.setattr(script_module, "_indices", {})
+
+    def _save(name: str, aliases=(), playtest: bool = False) -> Script:
+        script = Script(
+            name,
+            [load_character("Chef")],
+            aliases=list(aliases),
+            playtest=playtest,
+        )
+        script.save()
+        return script
+
+    return _save
+
+
+def test_default_scripts_are_found(saved):
+    assert find_script("Trouble Brewing").name == "Trouble Brewing"
+    assert find_script("moon").name == "Bad Moon Rising"
+    assert find_script("violets").name == "Sects & Violets"
+
+
+def test_matches_ignore_case(saved):
+    saved("Custom Chaos")
+    assert find_script("cUsToM").name == "Custom Chaos"
+    assert find_script("tb").name == "Trouble Brewing"
+
+
+def test_aliases_match_whole(saved):
+    saved("Custom Chaos", aliases=["CC"])
+    assert find_script("CC").name == "Custom Chaos"
+    assert find_script("BMR").name == "Bad Moon Rising"
+    assert find_script("BM") is None
+
+
+def test_default_scripts_match_before_saved_scripts(saved):
+    saved("Brewing Storm")
+    assert find_script("brewing").name == "Trouble Brewing"
+    assert find_script("storm").name == "Brewing Storm"
+
+
+def test_saved_scripts_match_in_file_order(saved):
+    saved("Beta Night")
+    saved("Alpha Night")
+    assert find_script("night").name == "Alpha Night"
+
+
+def test_playtest_scripts_are_searched_last(saved):
+    saved("Playtest Chaos", playtest=True)
+    saved("Chaos Theory")
+    assert find_script("playtest") is None
+    assert find_script("playtest", playtest=True).name == "Playtest Chaos"
+    assert find_script("chaos", playtest=True).name == "Chaos Theory"
+
+
+def test_misses_find_nothing(saved):
+    assert find_script("no such script") is None
+
+
+def test_newly_saved_scripts_are_found(saved):
+    assert find_script("custom") is None
+    saved("Custom Chaos")
+    assert find_script("custom").name == "Custom Chaos"
+
+
+def test_names_match_whole(saved):
+    saved("Custom Chaos")
+    assert find_script_named("custom chaos").name == "Custom Chaos"
+    assert find_script_named("TROUBLE BREWING").name == "Trouble Brewing"
+    assert find_script_named("custom") is None
+
+
+def test_only_the_match_is_built():
+    code = (
+        "import sys\n"
+        "from lib.logic.Script import find_script\n"
+        "find_script('trouble')\n"
+        "loaded = set(sys.modules)\n"
+        "assert 'resources.basegame.characters.Chef' in loaded\n"
+        "assert 'resources.basegame.characters.Vortox' not in loaded\n"
+        "assert 'resources.basegame.characters.Moonchild' not in loaded\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[1]
+    )
@@ -0,0 +1,81 @@
+"""Tests for lib.logic.SeatingRing."""
+
+from lib.logic.SeatingRing import SeatingRing
+
+
+class _Player:
+    """The parts of Player which SeatingRing uses."""
+
+    def __init__(self, idn: int):
+        self.id = idn
+        self.position = None
+
+
+def _ring(count: int) -> SeatingRing:
+    return SeatingRing([_Player(i) for i in range(count)])
+
+
+def _ids(players) -> list:
+    return [x.id for x in players]
+
+
+def _assert_positions(ring: SeatingRing):
+    for position, player in enumerate(ring.players):
+        assert player.position == position
+        assert ring.position(player) == position
+        assert player in ring
+
+
+def test_positions_are_assigned():
+    ring = _ring(4)
+    _assert_positions(ring)
+
+
+def test_neighbors_wrap_around():
+    ring = _ring(4)
+    first, _, _, last = ring.players
+    assert ring.next(last) is first
+    assert ring.previous(first) is last
+
+
+def test_insert_moves_later_players_down():
+    ring = _ring(4)
+    traveler = _Player(10)
+    ring.insert(2, traveler)
+
+    assert _ids(ring) == [0, 1, 10, 2, 3]
+    _assert_positions(ring)
+    assert ring.next(ring.players[1]) is traveler
+
+
+def test_remove_moves_later_players_up():
+    ring = _ring(5)
+    removed = ring.players[1]
+    ring.remove(removed)
+
+    assert _ids(ring) == [0, 2, 3, 4]
+    assert removed not in ring
+    _assert_positions(ring)
+    assert ring.next(ring.players[0]) is ring.players[1]
+
+
+def test_walk_and_after():
+    ring = _ring(4)
+    player = ring.players[1]
+    assert _ids(ring.walk(player)) == [2, 3, 0]
+    assert _ids(ring.walk(player, upwards=True)) == [0, 3, 2]
+    assert _ids(ring.after(player)) == [2, 3, 0, 1]
+
+
+def test_neighbors_skip_players_failing_the_condition():
+    ring = _ring(5)
+    upwards, downwards = ring.neighbors(
+        ring.players[0], None, lambda x, game: x.id in (2, 3)
+    )
+    assert upwards.id == 3
+    assert downwards.id == 2
+
+    assert ring.neighbors(ring.players[0], None, lambda x, game: False) == (
+        None,
+        None,
+    )
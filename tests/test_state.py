@@ -0,0 +1,71 @@
+"""Tests for lib.state."""
+
+import pickle
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("discord")
+
+from lib.logic.Effect import Poisoned  # noqa: E402
+from lib.logic.Game import Game  # noqa: E402
+from lib.state import (FORMAT_VERSION, StateError, class_name,  # noqa: E402
+                       dumps, is_state, loads, resolve_class)
+from tests.conftest import message  # noqa: E402
+
+
+def test_plain_data_round_trips():
+    state = {"a": [1, "two", None], "time": datetime(2020, 1, 1), "b": {3: 4.5}}
+    data = dumps(state)
+    assert is_state(data)
+    assert loads(data) == state
+
+
+def test_legacy_pickles_are_not_states():
+    assert not is_state(pickle.dumps({"a": 1}))
+    with pytest.raises(StateError):
+        loads(pickle.dumps({"a": 1}))
+
+
+def test_arbitrary_globals_are_refused():
+    data = dumps(None)[:6] + pickle.dumps(print, protocol=4)
+    with pytest.raises(StateError):
+        loads(data)
+
+
+def test_newer_versions_are_refused():
+    data = bytearray(dumps(None))
+    data[4:6] = (FORMAT_VERSION + 1).to_bytes(2, "big")
+    with pytest.raises(StateError):
+        loads(bytes(data))
+
+
+def test_classes_round_trip_by_name():
+    assert resolve_class(class_name(Poisoned)) is Poisoned
+
+
+def test_games_round_trip(game):
+    chef, empath, poisoner = game.seating_order[:3]
+    effect = Poisoned(empath, poisoner)
+    empath.effects.append(effect)
+    game.register_effect(effect)
+    entry = message(chef, empath, "hello")
+    chef.message_history.append(entry)
+    empath.message_history.append(entry)
+
+    restored = Game.from_state(loads(dumps(game.to_state())))
+
+    assert [x.id for x in restored.seating_order] == [1, 2, 3, 4, 5]
+    assert [type(x.character) for x in restored.seating_order] == [
+        type(x.character) for x in game.seating_order
+    ]
+    assert [x.id for x in restored.storytellers] == [100]
+    assert restored.script.character_list == game.script.character_list
+
+    chef, empath, poisoner = restored.seating_order[:3]
+    poisoning = [x for x in empath.effects if isinstance(x, Poisoned)]
+    assert len(poisoning) == 1
+    assert poisoning[0].source_player is poisoner
+    assert poisoning[0] in restored.effects_caused_by(poisoner)
+    assert chef.message_history[0] is empath.message_history[0]
+    assert chef.message_history[0]["from"] is chef
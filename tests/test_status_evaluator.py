@@ -0,0 +1,83 @@
+"""Tests for lib.logic.StatusEvaluator."""
+
+from lib.logic.StatusEvaluator import StatusEvaluator
+
+
+def test_statuses_without_cycles_are_final():
+    evaluator = StatusEvaluator()
+    assert evaluator.evaluate("a", lambda: True) == (True, True)
+    assert evaluator.evaluate("b", lambda: False) == (False, True)
+
+
+def test_dependencies_without_cycles_are_final():
+    evaluator = StatusEvaluator()
+    results = {}
+
+    def a():
+        results["b"] = evaluator.evaluate("b", lambda: True)
+        return results["b"][0]
+
+    assert evaluator.evaluate("a", a) == (True, True)
+    assert results["b"] == (True, True)
+
+
+def test_cycles_resolve_to_the_least_fixed_point():
+    evaluator = StatusEvaluator()
+    results = {}
+
+    # a holds if b does, and b holds if a does
+    def a():
+        results["b"] = evaluator.evaluate("b", b)
+        return results["b"][0]
+
+    def b():
+        results["a again"] = evaluator.evaluate("a", a)
+        return results["a again"][0]
+
+    assert evaluator.evaluate("a", a) == (False, True)
+    assert results["a again"] == (False, False)
+    assert results["b"] == (False, False)
+
+
+def test_cycles_through_negation_are_provisional_until_the_root():
+    evaluator = StatusEvaluator()
+    results = {}
+
+    # a holds unless b does, and b holds if a does
+    def a():
+        results["b"] = evaluator.evaluate("b", b)
+        return not results["b"][0]
+
+    def b():
+        return evaluator.evaluate("a", a)[0]
+
+    assert evaluator.evaluate("a", a) == (True, True)
+    assert results["b"] == (False, False)
+
+
+def test_statuses_outside_the_cycle_stay_final():
+    evaluator = StatusEvaluator()
+    results = {}
+
+    # a depends on c, which is independent, and on b, which depends on a
+    def a():
+        results["c"] = evaluator.evaluate("c", lambda: True)
+        results["b"] = evaluator.evaluate("b", lambda: evaluator.evaluate("a", a)[0])
+        return results["c"][0] and not results["b"][0]
+
+    assert evaluator.evaluate("a", a) == (True, True)
+    assert results["c"] == (True, True)
+    assert results["b"] == (False, False)
+
+
+def test_the_evaluator_is_reusable_after_errors():
+    evaluator = StatusEvaluator()
+
+    def fail():
+        raise RuntimeError
+
+    try:
+        evaluator.evaluate("a", fail)
+    except RuntimeError:
+        pass
+    assert evaluator.evaluate("a", lambda: True) == (True, True)
@@ -0,0 +1,51 @@
+"""Tests for lib.utils."""
+
+import pytest
+
+pytest.importorskip("discord")
+
+from lib.utils import chunk_message  # noqa: E402
+
+
+def test_short_text_is_one_chunk():
+    assert chunk_message("hello\nworld") == ["hello\nworld"]
+
+
+def test_splits_between_lines():
+    assert chunk_message("aaaa\nbbbb\ncccc", 9) == ["aaaa\nbbbb", "cccc"]
+
+
+def test_splits_long_lines_between_words():
+    text = "one two three four five six"
+    chunks = chunk_message(text, 12)
+    assert len(chunks) > 1
+    assert " ".join(chunks).replace("\n", " ").split() == text.split()
+    for chunk in chunks:
+        assert len(chunk) <= 12
+
+
+def test_splits_long_words():
+    assert chunk_message("a" * 12, 8) == ["a" * 4, "a" * 4, "a" * 4]
+
+
+def test_reopens_code_blocks_with_their_language():
+    text = "```py\n" + "\n".join(["x = 1"] * 4) + "\n```"
+    chunks = chunk_message(text, 24)
+    assert chunks == ["```py\nx = 1\nx = 1\n```", "```py\nx = 1\nx = 1\n```"]
+    for chunk in chunks:
+        assert len(chunk) <= 24
+
+
+@pytest.mark.parametrize(
+    "text", ["\n" + "a" * 20, "a" * 20 + "\n", "\n\n" + "a" * 20 + "\n\n"],
+)
+def test_blank_lines_beside_long_lines_give_no_blank_chunks(text):
+    chunks = chunk_message(text, 10)
+    assert chunks
+    for chunk in chunks:
+        assert chunk.strip()
+        assert len(chunk) <= 10
+
+
+def test_blank_text_is_kept():
+    assert chunk_message("") == [""]